@@ -3,10 +3,11 @@ from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi_limiter import FastAPILimiter
 
 from src.routes import auth, users, photos, comments, tags
-from src.conf.constants import API
+from src.conf.constants import API, NEXT_CURSOR_HEADER
 from src.conf.errors import (
     NotFoundError,
     ForbiddenError,
@@ -15,12 +16,17 @@ from src.conf.errors import (
     ConflictError,
 )
 from src.database.dependencies import get_redis
+from src.services.password import (
+    start_password_executor,
+    shutdown_password_executor,
+)
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     """
-    Initialize FastAPI Limiter on app startup, to prevent abuse and ensure fair usage of the API.
+    Initialize FastAPI Limiter on app startup, to prevent abuse and ensure fair usage of the API,
+    and start the process pool for password hashing.
 
     :param _: FastAPI app instance
     :type _: FastAPI
@@ -33,11 +39,13 @@ async def lifespan(_: FastAPI):
     await FastAPILimiter.init(
         redis_connection,
     )
+    start_password_executor()
     yield
+    shutdown_password_executor()
     await FastAPILimiter.close()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 origins = ["http://localhost:3000"]
 app.add_middleware(
@@ -46,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(auth.router, prefix=API)
@@ -2,7 +2,6 @@ import asyncio
 import re
 import argparse
 import sys
-from datetime import datetime
 
 from prompt_toolkit.validation import Validator, ValidationError
 from prompt_toolkit import prompt
@@ -14,7 +13,6 @@ from src.database.dependencies import (
     get_password_handler,
     get_user_repository,
 )
-from src.database.models import RefreshToken, LogoutAccessToken
 from src.conf.constants import (
     MAX_USERNAME_LENGTH,
     TOO_LONG_USERNAME_MESSAGE,
@@ -27,8 +25,8 @@ from src.conf.constants import (
     MIN_USERNAME_LENGTH,
     TOO_SHORT_USERNAME_MESSAGE,
 )
-from src.repository.abstract import AbstractUserRepo
 from src.services.abstract import AbstractAvatarProvider, AbstractPasswordHandler
+from src.services.auth import auth_service
 
 
 class UserNameValidator(Validator):
@@ -80,35 +78,22 @@ async def __add_admin_to_db(
     username,
     email,
     password,
-    user_repo: AbstractUserRepo = get_user_repository(),
     password_handler: AbstractPasswordHandler = get_password_handler(),
     avatar_provider: AbstractAvatarProvider = get_avatar_provider(),
 ):
-    avatar = avatar_provider.get_avatar(email, 255)
-    await user_repo.create_admin(
-        name=username,
-        email=email,
-        hashed_password=password_handler.get_password_hash(password),
-        avatar=avatar,
-    )
-
-
-async def __delete_exp_tokens(token_type: str):
-    if token_type == "refresh_token":
-        token_to_clean = RefreshToken
-    elif token_type == "access_token":
-        token_to_clean = LogoutAccessToken
-    else:
-        raise ValueError("token_type must be either 'refresh_token' or 'access_token'")
     db = SessionLocal()
-    tokens_to_delete = (
-        db.query(token_to_clean)
-        .filter(token_to_clean.expires_at < datetime.utcnow())
-        .all()
-    )
-    for token in tokens_to_delete:
-        db.delete(token)
-    db.commit()
+    try:
+        user_repo = get_user_repository(db)
+        avatar = avatar_provider.get_avatar(email, 255)
+        await user_repo.create_admin(
+            name=username,
+            email=email,
+            hashed_password=await password_handler.get_password_hash(password),
+            avatar=avatar,
+        )
+        await auth_service.delete_unknown_email(email)
+    finally:
+        db.close()
 
 
 def create_admin():
@@ -124,24 +109,8 @@ def create_admin():
     print("Admin user created.")
 
 
-def clean_access_tokens():
-    try:
-        asyncio.run(__delete_exp_tokens("access_token"))
-    except Exception as e:
-        print(e)
-
-
-def clean_refresh_tokens():
-    try:
-        asyncio.run(__delete_exp_tokens("refresh_token"))
-    except Exception as e:
-        print(e)
-
-
 CALLABLE_FUNCTIONS = {
     "create_admin": create_admin,
-    "clean_access_tokens": clean_access_tokens,
-    "clean_refresh_tokens": clean_refresh_tokens,
 }
 
 
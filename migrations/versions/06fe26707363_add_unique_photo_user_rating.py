@@ -0,0 +1,31 @@
+"""add unique photo_id, user_id constraint to Rating
+
+Revision ID: 06fe26707363
+Revises: 84419c32b5e0
+Create Date: 2026-10-16 09:12:41.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '06fe26707363'
+down_revision: Union[str, None] = '84419c32b5e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # keep only the latest rating of each user for each photo before adding the constraint
+    op.execute(
+        "DELETE FROM ratings r USING ratings newer "
+        "WHERE r.photo_id = newer.photo_id AND r.user_id = newer.user_id AND r.id < newer.id"
+    )
+    op.create_unique_constraint('unique_photo_user_rating', 'ratings', ['photo_id', 'user_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('unique_photo_user_rating', 'ratings', type_='unique')
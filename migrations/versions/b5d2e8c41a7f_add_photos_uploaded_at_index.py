@@ -0,0 +1,26 @@
+"""add uploaded_at, id index to Photo
+
+Revision ID: b5d2e8c41a7f
+Revises: 06fe26707363
+Create Date: 2026-10-16 11:02:17.524031
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d2e8c41a7f'
+down_revision: Union[str, None] = '06fe26707363'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_photos_uploaded_at_id', 'photos', ['uploaded_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_photos_uploaded_at_id', table_name='photos')
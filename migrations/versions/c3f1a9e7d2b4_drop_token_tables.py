@@ -0,0 +1,46 @@
+"""drop refresh_tokens and logout_access_tokens tables
+
+Revision ID: c3f1a9e7d2b4
+Revises: b5d2e8c41a7f
+Create Date: 2026-10-16 14:21:43.187652
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1a9e7d2b4'
+down_revision: Union[str, None] = 'b5d2e8c41a7f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f('ix_logout_access_tokens_logout_access_token'), table_name='logout_access_tokens')
+    op.drop_table('logout_access_tokens')
+    op.drop_index(op.f('ix_refresh_tokens_refresh_token'), table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
+
+
+def downgrade() -> None:
+    op.create_table('refresh_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('refresh_token', sa.String(length=350), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.String(length=150), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_id')
+    )
+    op.create_index(op.f('ix_refresh_tokens_refresh_token'), 'refresh_tokens', ['refresh_token'], unique=True)
+    op.create_table('logout_access_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('logout_access_token', sa.String(length=350), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_logout_access_tokens_logout_access_token'), 'logout_access_tokens', ['logout_access_token'], unique=True)
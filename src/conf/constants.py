@@ -2,6 +2,8 @@
 Set of constants used in the project.
 """
 
+from typing import Literal
+
 from fastapi_limiter.depends import RateLimiter
 
 
@@ -17,6 +19,18 @@ TOO_SHORT_USERNAME_MESSAGE = (
     f"Username must be at least {MIN_USERNAME_LENGTH} characters long."
 )
 MAX_TAGS_AMOUNT = 5
+TRANSFORM_EFFECTS: frozenset[str] = frozenset(
+    {
+        "art",
+        "cartoonify",
+        "pixelate",
+        "saturation",
+        "blur",
+        "sepia",
+        "grayscale",
+        "vignette",
+    }
+)
 
 MAX_PASSWORD_LENGTH = 45
 TOO_LONG_PASSWORD_MESSAGE = (
@@ -33,6 +47,7 @@ INVALID_PASSWORD_MESSAGE = "Password must contain at least one uppercase and low
 ROLE_ADMIN = "admin"
 ROLE_MODERATOR = "moderator"
 ROLE_STANDARD = "standard"
+STAFF_ROLES: frozenset[str] = frozenset({ROLE_ADMIN, ROLE_MODERATOR})
 
 API_V1 = "/api/v1"
 API = API_V1
@@ -55,12 +70,6 @@ COULD_NOT_VALIDATE_CREDENTIALS = "Could not validate credentials"
 LOG_IN_AGAIN = "You need to log in again"
 INCORRECT_USERNAME_OR_PASSWORD = "Incorrect username or password"
 
-HTTP_401_UNAUTHORIZED_DETAILS = [
-    INVALID_SCOPE,
-    COULD_NOT_VALIDATE_CREDENTIALS,
-    LOG_IN_AGAIN,
-]
-
 FORBIDDEN_OPERATION_ON_ADMIN_ACCOUNT = (
     "Only admin can perform operations on users with admin role."
 )
@@ -73,50 +82,60 @@ FORBIDDEN_FOR_NOT_OWNER = "Only the owner can perform this operation."
 FORBIDDEN_FOR_OWNER = "Only not-owner can perform this operation."
 BANNED_USER = "User is banned."
 
-HTTP_403_FORBIDDEN_DETAILS = [
-    FORBIDDEN_OPERATION_ON_ADMIN_ACCOUNT,
-    FORBIDDEN_FOR_USER,
-    FORBIDDEN_FOR_USER_AND_MODERATOR,
-    FORBIDDEN_FOR_NOT_OWNER,
-    BANNED_USER,
-]
-
-
 TOKEN_NOT_FOUND = "Token not found"
 USER_NOT_FOUND = "User not found"
 PHOTO_NOT_FOUND = "Photo not found"
 RATING_NOT_FOUND = "Rating not found"
 TAG_NOT_FOUND = "Tag not found"
 
-HTTP_404_NOT_FOUND_DETAILS = [TOKEN_NOT_FOUND, USER_NOT_FOUND, PHOTO_NOT_FOUND]
+DB_POOL_SIZE = 20
+DB_MAX_OVERFLOW = 10
+DB_POOL_TIMEOUT = 5  # seconds
+DB_POOL_RECYCLE = 1800  # seconds
 
 USERNAME_EXISTS = "User with this username already exists"
 EMAIL_EXISTS = "User with this email already exists"
 
 TOKEN_DELETED = "Token deleted"
 
+ARGON2_TIME_COST = 2
+ARGON2_MEMORY_COST = 19456  # KiB
+ARGON2_PARALLELISM = 1
+ARGON2_HASH_LEN = 32
+ARGON2_SALT_LEN = 16
+
 REDIS_EXPIRE = 60 * 15  # seconds
+UNKNOWN_EMAIL_EXPIRE = 30  # seconds
 ACCESS_TOKEN_EXPIRE = 15  # minutes
 REFRESH_TOKEN_EXPIRE = 7  # days
+ACCESS_TOKEN_CACHE_SIZE = 10000
+ACCESS_TOKEN_CACHE_TTL = 60  # seconds
+
+QR_CODE_CACHE_SIZE = 1024
+QR_CODE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+USER_CACHE_CONTROL = "private, no-cache"
 
 AVATAR_WIDTH = 250
 AVATAR_HEIGHT = 250
 DEFAULT_AVATAR_URL_START_V1_GRAVATAR = "https://www.gravatar.com/avatar/"
 CLOUDINARY_PHOTO_PUBLIC_ID_PREFIX = "PhotoShare_fastapi"
 CLOUDINARY_AVATAR_PUBLIC_ID_PREFIX = CLOUDINARY_PHOTO_PUBLIC_ID_PREFIX + "/avatars"
+PHOTO_UPLOAD_CHUNK_SIZE = 20_000_000  # bytes, Cloudinary requires at least 5 MB
 
-PHOTO_SEARCH_ENUMS = [
+PhotoSortType = Literal[
     "upload_date-desc",
     "upload_date-asc",
     "rating-desc",
     "rating-asc",
 ]
-INVALID_SORT_TYPE = "Invalid sort type"
+INVALID_CURSOR = "Invalid pagination cursor"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 PHOTO_CREATED = "Photo successfully created"
 PHOTO_DELETED = "Photo deleted"
 PHOTO_UPDATED = "Photo updated"
 PHOTO_RATED = "Photo rated"
 RATING_DELETED = "Rating deleted"
+PHOTO_CACHE_EXPIRE = 60  # seconds
 
 COMMENT_CREATED = "Comment created"
 COMMENT_NOT_FOUND = "Comment not found"
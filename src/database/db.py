@@ -2,22 +2,55 @@
 Database session management..
 """
 
+from fastapi import HTTPException
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.conf.config import settings
+from src.conf.constants import (
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+)
+from src.conf.errors import (
+    NotFoundError,
+    ForbiddenError,
+    UnauthorizedError,
+    ConflictError,
+)
 from src.conf.logger import logger
 
 SQLALCHEMY_DATABASE_URL = settings.sqlalchemy_database_url
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, echo_pool=True)
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    echo_pool=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# errors turned into 4xx responses, they are part of normal request flow
+_CLIENT_ERRORS = (
+    HTTPException,
+    NotFoundError,
+    ForbiddenError,
+    UnauthorizedError,
+    ConflictError,
+)
+
 
 def get_db():
     """
-    Create a new database session.
+    Create a new database session. Used as a request scoped dependency,
+    so all repositories in one request share the session and it is closed
+    (connection returned to the pool) when the request is finished.
+    Unexpected errors are logged and rolled back, client errors (4xx) are only re-raised.
 
     Yields:
         Session: Database session.
@@ -26,8 +59,11 @@ def get_db():
 
     try:
         yield db
+    except _CLIENT_ERRORS:
+        raise
     except Exception as e:
         logger.exception(e)
         db.rollback()
+        raise
     finally:
         db.close()
@@ -2,7 +2,9 @@
 This module contains all the dependencies for the application.
 """
 
+from fastapi import Depends
 from redis.asyncio import Redis
+from sqlalchemy.orm import Session
 
 from src.database.db import get_db
 from src.repository.abstract import (
@@ -19,12 +21,14 @@ from src.services.abstract import (
     AbstractAvatarProvider,
     AbstractPhotoStorageProvider,
     AbstractQrCodeProvider,
+    AbstractCache,
 )
 from src.services.avatar import AvatarProviderGravatar
 from src.services.abstract import AbstractPasswordHandler
-from src.services.password import BcryptPasswordHandler
+from src.services.password import Argon2PasswordHandler
 from src.services.photo_storage_provider import CloudinaryPhotoStorageProvider
 from src.services.qr_code import QrCodeProvider
+from src.services.cache import RedisCache
 from src.conf.config import settings
 
 
@@ -34,7 +38,7 @@ def get_password_handler() -> AbstractPasswordHandler:
 
     :return: password handler inherited from AbstractPasswordHandler
     """
-    return BcryptPasswordHandler()
+    return Argon2PasswordHandler()
 
 
 def get_avatar_provider() -> AbstractAvatarProvider:
@@ -64,38 +68,48 @@ def get_photo_storage_provider() -> AbstractPhotoStorageProvider:
     return CloudinaryPhotoStorageProvider()
 
 
-def get_user_repository() -> AbstractUserRepo:
+def get_user_repository(db: Session = Depends(get_db)) -> AbstractUserRepo:
     """
     Function to get user repository.
 
+    :param db: database session of the request
+    :type db: Session
     :return: user repository inherited from AbstractUserRepo
     """
-    return PostgresUserRepo(next(get_db()))
+    return PostgresUserRepo(db)
 
 
-def get_photo_repository() -> AbstractPhotoRepo:
+def get_photo_repository(db: Session = Depends(get_db)) -> AbstractPhotoRepo:
     """
     Function to get photo repository.
 
+    :param db: database session of the request
+    :type db: Session
     :return: photo repository inherited from AbstractPhotoRepo
     """
-    return PostgresPhotoRepo(next(get_db()))
+    return PostgresPhotoRepo(db)
 
 
-def get_comment_repository() -> AbstractCommentRepo:
+def get_comment_repository(db: Session = Depends(get_db)) -> AbstractCommentRepo:
     """
     Function to get comment repository.
 
+    :param db: database session of the request
+    :type db: Session
     :return: comment repository inherited from AbstractCommentRepo
     """
-    return PostgresCommentRepo(next(get_db()))
+    return PostgresCommentRepo(db)
 
 
-def get_tag_repository() -> AbstractTagRepo:
+def get_tag_repository(db: Session = Depends(get_db)) -> AbstractTagRepo:
     """
     Function to get tag repository.
+
+    :param db: database session of the request
+    :type db: Session
+    :return: tag repository inherited from AbstractTagRepo
     """
-    return PostgresTagRepo(next(get_db()))
+    return PostgresTagRepo(db)
 
 
 def get_redis(**kwargs) -> Redis:
@@ -112,3 +126,18 @@ def get_redis(**kwargs) -> Redis:
         **kwargs,
     )
     return redis
+
+
+response_cache: AbstractCache | None = None
+
+
+def get_cache() -> AbstractCache:
+    """
+    Function to get cache of serialized responses. The Redis connection is created on first use.
+
+    :return: cache inherited from AbstractCache
+    """
+    global response_cache
+    if response_cache is None:
+        response_cache = RedisCache(get_redis(db=1))
+    return response_cache
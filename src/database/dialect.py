@@ -0,0 +1,21 @@
+"""
+Dialect specific SQL constructs.
+"""
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def insert_for(db: Session, table):
+    """
+    Returns INSERT construct supporting ON CONFLICT clauses for the dialect of the session
+    (PostgreSQL, or SQLite used in tests).
+
+    :param db: database session the statement will be executed with
+    :type db: Session
+    :param table: model to insert into
+    :return: dialect specific insert construct
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
@@ -8,11 +8,14 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     UniqueConstraint,
+    Index,
+    Float,
     func,
+    select,
+    cast,
 )
-from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql.sqltypes import DateTime
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy.orm import relationship, declarative_base, backref, column_property
 
 from src.conf.constants import (
     MAX_TAG_NAME_LENGTH,
@@ -55,9 +58,11 @@ class Photo(Base):
         tags: relationship to the tags associated with the photo.
         comments: relationship to the comments associated with the photo.
         ratings: relationship to the ratings associated with the photo.
+        average_rating: average score of the photo ratings, computed in SQL (None if photo has no ratings).
     """
 
     __tablename__ = "photos"
+    __table_args__ = (Index("ix_photos_uploaded_at_id", "uploaded_at", "id"),)
 
     id = Column(Integer, primary_key=True)
     user_id = Column(
@@ -68,17 +73,11 @@ class Photo(Base):
     description = Column(String(MAX_DESCRIPTION_LENGTH), nullable=True)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    user = relationship("User", backref="photos")
+    user = relationship("User", backref=backref("photos", passive_deletes=True))
     tags = relationship("Tag", secondary=photo_m2m_tag, backref="photos")
     comments = relationship("Comment", backref="photo", cascade="all, delete-orphan")
     ratings = relationship("Rating", backref="photo", cascade="all, delete-orphan")
 
-    @hybrid_property
-    def average_rating(self):
-        if self.ratings:
-            return sum(rating.score for rating in self.ratings) / len(self.ratings)
-        return None
-
 
 class User(Base):
     """
@@ -94,7 +93,6 @@ class User(Base):
         avatar (str): URL of the user's avatar.
         is_active (bool): Whether the user is active or banned.
 
-        refresh_tokens: relationship to the refresh tokens associated with the user.
         comments: relationship to the comments posted by the user.
         ratings: relationship to the ratings given by the user.
     """
@@ -114,11 +112,12 @@ class User(Base):
     avatar = Column(String(255), nullable=True)
     is_active = Column(Boolean(), default=True)
 
-    refresh_tokens = relationship(
-        "RefreshToken", backref="user", cascade="all, delete-orphan"
+    comments = relationship(
+        "Comment", backref="user", cascade="all, delete-orphan", passive_deletes=True
+    )
+    ratings = relationship(
+        "Rating", backref="user", cascade="all, delete-orphan", passive_deletes=True
     )
-    comments = relationship("Comment", backref="user", cascade="all, delete-orphan")
-    ratings = relationship("Rating", backref="user", cascade="all, delete-orphan")
 
 
 class Tag(Base):
@@ -172,9 +171,14 @@ class Rating(Base):
         photo_id (int): Foreign key to the photo the rating belongs to.
         user_id (int): Foreign key to the user who posted the rating.
         score (int): Score of the rating.
+
+    Each user can rate a photo only once (unique photo_id, user_id pair).
     """
 
     __tablename__ = "ratings"
+    __table_args__ = (
+        UniqueConstraint("photo_id", "user_id", name="unique_photo_user_rating"),
+    )
 
     id = Column(Integer, primary_key=True)
     photo_id = Column(
@@ -186,39 +190,11 @@ class Rating(Base):
     score = Column(Integer, nullable=False)
 
 
-class RefreshToken(Base):
-    """
-    SQLAlchemy model represents a refresh token in the database.
-
-    Attributes:
-        id (int): Primary key.
-        refresh_token (str): Refresh token.
-        user_id (int): Foreign key to the user the refresh token belongs to.
-        session_id (str): Session ID of the refresh token.
-        expires_at (datetime): Datetime when the refresh token expires.
-    """
-
-    __tablename__ = "refresh_tokens"
-    id = Column(Integer, primary_key=True)
-    refresh_token = Column(String(350), nullable=False, unique=True, index=True)
-    user_id = Column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
-    )
-    session_id = Column(String(150), nullable=False, unique=True)
-    expires_at = Column(DateTime(timezone=True), nullable=False)
-
-
-class LogoutAccessToken(Base):
-    """
-    SQLAlchemy model represents a logout access token in the database.
-
-    Attributes:
-        id (int): Primary key.
-        logout_access_token (str): Logout access token.
-        expires_at (datetime): Datetime when the logout access token expires.
-    """
-
-    __tablename__ = "logout_access_tokens"
-    id = Column(Integer, primary_key=True)
-    logout_access_token = Column(String(350), nullable=False, unique=True, index=True)
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+# Average rating is loaded with the photo row as a correlated subquery,
+# so listing photos does not load every rating of every photo.
+Photo.average_rating = column_property(
+    select(cast(func.avg(Rating.score), Float))
+    .where(Rating.photo_id == Photo.id)
+    .correlate_except(Rating)
+    .scalar_subquery()
+)
@@ -1,10 +1,9 @@
 import abc
-from datetime import datetime
 from typing import Type
 
-from src.schemas.users import UserIn, ActiveStatus, UserRoleIn
+from src.schemas.users import UserIn, UserUpdate, ActiveStatus, UserRoleIn
 from src.database.models import User, Photo, Rating, Comment, Tag
-from src.schemas.photos import PhotoIn, RatingIn
+from src.schemas.photos import PhotoIn, RatingIn, PhotoCursor
 
 
 class AbstractUserRepo(abc.ABC):
@@ -36,6 +35,24 @@ class AbstractUserRepo(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def email_or_username_exists(
+        self, email: str, username: str, exclude_id: int | None = None
+    ) -> tuple[bool, bool]:
+        """
+        Checks in one query if users with provided email or username exist in database
+
+        :param email: email to check
+        :type email: str
+        :param username: username to check
+        :type username: str
+        :param exclude_id: id of user to skip in the check, e.g. user who is updating own data
+        :type exclude_id: int | None
+        :return: tuple (email taken, username taken)
+        :rtype: tuple[bool, bool]
+        """
+        pass
+
     @abc.abstractmethod
     async def get_user_by_id(self, user_id: int) -> User:
         """
@@ -49,15 +66,19 @@ class AbstractUserRepo(abc.ABC):
         pass
 
     @abc.abstractmethod
-    async def get_users(self, skip: int, limit: int) -> list[Type[User]]:
+    async def get_users(
+        self, after_id: int | None, limit: int, fields: list[str] | None = None
+    ) -> list[Type[User]]:
         """
-        Returns users from database
+        Returns users from database using keyset pagination on user id
 
-        :param skip: number of users to skip
-        :type skip: int
+        :param after_id: id of the last user from the previous page (None for the first page)
+        :type after_id: int | None
         :param limit: number of users to return
         :type limit: int
-        :return: list of users
+        :param fields: names of user columns to select, whole users are returned if None
+        :type fields: list[str] | None
+        :return: list of users, or rows with only the selected columns if fields are given
         :rtype: list[User]
         """
         pass
@@ -98,12 +119,12 @@ class AbstractUserRepo(abc.ABC):
         pass
 
     @abc.abstractmethod
-    async def update_user(self, new_user_data: UserIn, user_id: int) -> User:
+    async def update_user(self, new_user_data: UserUpdate, user_id: int) -> User:
         """
         Updates user in database
 
         :param new_user_data: new user data
-        :type new_user_data: UserIn
+        :type new_user_data: UserUpdate
         :param user_id: id of user to update
         :type user_id: int
         :return: updated user
@@ -111,6 +132,19 @@ class AbstractUserRepo(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def update_user_password(self, user_id: int, hashed_password: str) -> None:
+        """
+        Updates user password hash in database
+
+        :param user_id: id of user to update password
+        :type user_id: int
+        :param hashed_password: new password hash
+        :type hashed_password: str
+        :return: None
+        """
+        pass
+
     @abc.abstractmethod
     async def update_user_avatar(self, user_id: int, new_avatar_url: str) -> User:
         """
@@ -138,64 +172,14 @@ class AbstractUserRepo(abc.ABC):
         pass
 
     @abc.abstractmethod
-    async def add_refresh_token(
-        self,
-        user_id: int,
-        token: str | None,
-        expiration_date: datetime,
-        session_id: str,
-    ) -> None:
+    async def get_user_photo_ids(self, user_id: int) -> list[int]:
         """
-        Adds refresh token to database
+        Gets ids of photos uploaded, commented or rated by user
 
-        :param user_id: id of user to add refresh token
+        :param user_id: id of user
         :type user_id: int
-        :param token: refresh token
-        :type token: str
-        :param expiration_date: expiration date of refresh token
-        :type expiration_date: datetime
-        :param session_id: id of current session
-        :type session_id: str
-        :return: None
-        """
-        pass
-
-    @abc.abstractmethod
-    async def delete_refresh_token(self, token: str, user_id: int) -> None:
-        """
-        Deletes refresh token from database
-
-        :param token: token to delete
-        :type token: str
-        :param user_id: id of user who token belongs to
-        :type user_id: int
-        :return: None
-        """
-        pass
-
-    @abc.abstractmethod
-    async def logout_user(self, token: str, session_id: str, user: User) -> User:
-        """
-        Saves user logout data in database
-
-        :param token: user refresh token to save
-        :type token: str
-        :param session_id: current session id to save
-        :type session_id: str
-        :param user: user to logout
-        :return: logged-out user
-        """
-        pass
-
-    @abc.abstractmethod
-    async def is_user_logout(self, token: str) -> bool:
-        """
-        Checks if user is logged out
-
-        :param token: user refresh token to check
-        :type token: str
-        :return: True if user is logged out, False otherwise
-        :rtype: bool
+        :return: ids of photos linked to user
+        :rtype: list[int]
         """
         pass
 
@@ -263,11 +247,12 @@ class AbstractPhotoRepo(abc.ABC):
         query: str,
         user_id: int,
         sort_by: str,
+        cursor: PhotoCursor | None = None,
     ) -> list[Type[Photo]]:
         """
         Gets photos from database
 
-        :param skip: number of photos to skip
+        :param skip: number of photos to skip, ignored when cursor is given (deprecated, use cursor instead)
         :type skip: int
         :param limit: number of photos to get
         :type limit: int
@@ -276,6 +261,8 @@ class AbstractPhotoRepo(abc.ABC):
         :param user_id: id of the user whose photos we are looking for
         :type user_id: int
         :param sort_by: how to sort returned photos
+        :param cursor: cursor pointing at the last photo of the previous page
+        :type cursor: PhotoCursor | None
         :return: list of photos
         :rtype: list[Type[Photo]]
         """
@@ -329,13 +316,13 @@ class AbstractPhotoRepo(abc.ABC):
 
     @abc.abstractmethod
     async def add_transform_photo(
-        self, photo_id: int, transform_params: list[str], transform_url: str
+        self, photo: Photo, transform_params: list[str], transform_url: str
     ) -> Photo:
         """
         Adds transform to photo in database
 
-        :param photo_id: id of photo to add transform to
-        :type photo_id: int
+        :param photo: photo to add transform to
+        :type photo: Photo
         :param transform_params: list of transform params
         :type transform_params: list[str]
         :param transform_url: url to transformed photo
@@ -395,6 +382,9 @@ class AbstractCommentRepo(abc.ABC):
         :type photo_id: int
         :param user_id: id of user that created comment
         :type user_id: int
+        :return: comment
+        :rtype: Comment
+        :raise: NotFoundError: if photo not found
         """
         pass
 
@@ -407,6 +397,7 @@ class AbstractCommentRepo(abc.ABC):
         :type photo_id: int
         :return: list of comments
         :rtype: list[Comment]
+        :raise: NotFoundError: if photo not found
         """
         pass
 
@@ -533,3 +524,15 @@ class AbstractTagRepo(abc.ABC):
         :rtype: Tag
         """
         pass
+
+    @abc.abstractmethod
+    async def get_tag_photo_ids(self, tag_id: int) -> list[int]:
+        """
+        Gets ids of photos linked to tag
+
+        :param tag_id: id of tag
+        :type tag_id: int
+        :return: ids of photos linked to tag
+        :rtype: list[int]
+        """
+        pass
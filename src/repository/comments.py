@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, literal, exists
 
 from src.conf.constants import (
     COMMENT_NOT_FOUND,
     FORBIDDEN_FOR_NOT_OWNER,
+    PHOTO_NOT_FOUND,
 )
 from src.conf.errors import NotFoundError, ForbiddenError
 from src.repository.abstract import AbstractCommentRepo
@@ -35,11 +37,25 @@ class PostgresCommentRepo(AbstractCommentRepo):
         :type user_id: int
         :return: comment
         :rtype: Comment
+        :raise: NotFoundError: if photo not found
         """
-        comment = Comment(content=comment_content, photo_id=photo_id, user_id=user_id)
-        self.db.add(comment)
+        # INSERT ... SELECT ... WHERE EXISTS - photo check and insert in one statement
+        comment = self.db.scalar(
+            insert(Comment)
+            .from_select(
+                [Comment.content, Comment.photo_id, Comment.user_id],
+                select(
+                    literal(comment_content), literal(photo_id), literal(user_id)
+                ).where(exists().where(Photo.id == photo_id)),
+            )
+            .returning(Comment)
+        )
+        if comment is None:
+            self.db.rollback()
+            raise NotFoundError(detail=PHOTO_NOT_FOUND)
+        # detached, so commit does not expire the returned row and reload it
+        self.db.expunge(comment)
         self.db.commit()
-        self.db.refresh(comment)
         return comment
 
     async def get_comments(self, photo_id: int) -> list[Comment]:
@@ -50,8 +66,16 @@ class PostgresCommentRepo(AbstractCommentRepo):
         :type photo_id: int
         :return: list of comments
         :rtype: list[Comment]
+        :raise: NotFoundError: if photo not found
         """
-        return self.db.query(Comment).filter(Comment.photo_id == photo_id).all()
+        comments = self.db.query(Comment).filter(Comment.photo_id == photo_id).all()
+        # photo existence is checked only when there are no comments to return
+        if (
+            not comments
+            and not self.db.query(exists().where(Photo.id == photo_id)).scalar()
+        ):
+            raise NotFoundError(detail=PHOTO_NOT_FOUND)
+        return comments
 
     async def get_comment_by_id(self, comment_id: int) -> Comment:
         """
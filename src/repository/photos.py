@@ -1,7 +1,7 @@
 from typing import Type
 
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import or_, func, tuple_
 from src.conf.constants import (
     PHOTO_NOT_FOUND,
     USER_NOT_FOUND,
@@ -13,8 +13,9 @@ from src.conf.constants import (
 )
 from src.conf.errors import NotFoundError, ForbiddenError
 from src.database.models import Photo, Tag, User, Rating
+from src.database.dialect import insert_for
 from src.repository.abstract import AbstractPhotoRepo
-from src.schemas.photos import PhotoIn, RatingIn
+from src.schemas.photos import PhotoIn, RatingIn, PhotoCursor
 from src.schemas.tags import TagIn
 
 
@@ -148,11 +149,13 @@ class PostgresPhotoRepo(AbstractPhotoRepo):
         query: str | None = None,
         user_id: int | None = None,
         sort_by: str | None = None,
+        cursor: PhotoCursor | None = None,
     ) -> list[Type[Photo]]:
         """
         Gets photos from database.
+        Photos are always ordered by the sort key and id, so cursor can be used for keyset pagination.
 
-        :param skip: number of photos to skip
+        :param skip: number of photos to skip, ignored when cursor is given (deprecated, use cursor instead)
         :type skip: int
         :param limit: number of photos to get
         :type limit: int
@@ -161,11 +164,15 @@ class PostgresPhotoRepo(AbstractPhotoRepo):
         :param user_id: id of the user whose photos we are looking for
         :type user_id: int
         :param sort_by: how to sort returned photos
+        :param cursor: cursor pointing at the last photo of the previous page
+        :type cursor: PhotoCursor | None
         :return: list of photos
         :rtype: list[Type[Photo]]
         :raises: NotFoundError: if user whose photos we are looking for not found in database
         """
-        query_base = self.db.query(Photo)
+        query_base = self.db.query(Photo).options(
+            selectinload(Photo.tags), selectinload(Photo.comments)
+        )
         if query:
             query_base = query_base.filter(
                 or_(
@@ -179,36 +186,45 @@ class PostgresPhotoRepo(AbstractPhotoRepo):
             if user is None:
                 raise NotFoundError(detail=USER_NOT_FOUND)
             query_base = query_base.filter(Photo.user_id == user_id)
-        if sort_by:
-            field, sort = sort_by.split("-")
-            if field == "upload_date":
-                query_base = query_base.order_by(
-                    Photo.uploaded_at.desc()
-                    if sort == "desc"
-                    else Photo.uploaded_at.asc()
+        field, sort = sort_by.split("-") if sort_by else (None, "asc")
+        if field == "upload_date":
+            sort_key = Photo.uploaded_at
+        elif field == "rating":
+            sort_key = func.coalesce(Photo.average_rating, 0)
+        else:
+            sort_key = None
+        if cursor:
+            if sort_key is None:
+                query_base = query_base.filter(Photo.id > cursor.id)
+            elif sort == "desc":
+                query_base = query_base.filter(
+                    tuple_(sort_key, Photo.id) < (cursor.value, cursor.id)
                 )
-            elif field == "rating":
-                query_base = (
-                    query_base.outerjoin(Rating)
-                    .group_by(Photo.id)
-                    .order_by(
-                        func.coalesce(func.avg(Rating.score), 0).desc()
-                        if sort == "desc"
-                        else func.coalesce(func.avg(Rating.score), 0).asc()
-                    )
+            else:
+                query_base = query_base.filter(
+                    tuple_(sort_key, Photo.id) > (cursor.value, cursor.id)
                 )
-        photos = query_base.offset(skip).limit(limit).all()
+        if sort_key is None:
+            query_base = query_base.order_by(Photo.id)
+        elif sort == "desc":
+            query_base = query_base.order_by(sort_key.desc(), Photo.id.desc())
+        else:
+            query_base = query_base.order_by(sort_key.asc(), Photo.id.asc())
+        # keyset pages start right after the cursor, so skip is ignored
+        if cursor is None:
+            query_base = query_base.offset(skip)
+        photos = query_base.limit(limit).all()
 
         return photos
 
     async def add_transform_photo(
-        self, photo_id: int, transform_params: list[str], transformation_url: str
+        self, photo: Photo, transform_params: list[str], transformation_url: str
     ) -> Photo:
         """
         Adds transform to photo in database
 
-        :param photo_id: id of photo to add transform to
-        :type photo_id: int
+        :param photo: photo (already loaded in this session) to add transform to
+        :type photo: Photo
         :param transform_params: list of transform params
         :type transform_params: list[str]
         :param transformation_url: url to transformed photo
@@ -216,20 +232,13 @@ class PostgresPhotoRepo(AbstractPhotoRepo):
         :return: updated photo
         :rtype: Photo
         """
-        photo = await self.get_photo_by_id(photo_id)
         transformations = photo.transformations or {}
-        photo.transformations = None
-        self.db.commit()
-        if len(transformations) == 0:
-            key = 1
-        else:
-            max_value = 0
-            for key in transformations:
-                if int(key) > max_value:
-                    max_value = int(key)
-            key = max_value + 1
-        transformations[key] = [transformation_url, transform_params]
-        photo.transformations = transformations
+        key = max((int(key) for key in transformations), default=0) + 1
+        # new dict is assigned so the JSON column change is detected and saved with one commit
+        photo.transformations = {
+            **transformations,
+            key: [transformation_url, transform_params],
+        }
         self.db.commit()
         self.db.refresh(photo)
         return photo
@@ -238,7 +247,7 @@ class PostgresPhotoRepo(AbstractPhotoRepo):
         self, photo_id: int, rating_in: RatingIn, user_id: int
     ) -> Rating:
         """
-        Rates photo in database
+        Rates photo in database. Rating is upserted with a single INSERT ... ON CONFLICT DO UPDATE statement.
 
         :param photo_id: id of photo to rate
         :type photo_id: int
@@ -253,18 +262,17 @@ class PostgresPhotoRepo(AbstractPhotoRepo):
         photo = await self.get_photo_by_id(photo_id)
         if user_id == photo.user_id:
             raise ForbiddenError(detail=FORBIDDEN_FOR_OWNER)
-        rating = (
-            self.db.query(Rating)
-            .filter(Rating.photo_id == photo_id, Rating.user_id == user_id)
-            .first()
-        )
-        if rating is None:
-            rating = Rating(photo_id=photo_id, user_id=user_id, score=rating_in.score)
-            self.db.add(rating)
-        else:
-            rating.score = rating_in.score
+        rating = self.db.scalars(
+            insert_for(self.db, Rating)
+            .values(photo_id=photo_id, user_id=user_id, score=rating_in.score)
+            .on_conflict_do_update(
+                index_elements=[Rating.photo_id, Rating.user_id],
+                set_={"score": rating_in.score},
+            )
+            .returning(Rating),
+            execution_options={"populate_existing": True},
+        ).one()
         self.db.commit()
-        self.db.refresh(rating)
         return rating
 
     async def delete_rating(self, photo_id: int, user_id: int) -> Rating:
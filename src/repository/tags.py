@@ -1,11 +1,13 @@
 from typing import Type
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.conf.constants import TAG_NOT_FOUND, TAG_ALREADY_EXISTS
 from src.conf.errors import NotFoundError, ConflictError
 from src.repository.abstract import AbstractTagRepo
-from src.database.models import Tag
+from src.database.models import Tag, photo_m2m_tag
+from src.database.dialect import insert_for
 
 
 class PostgresTagRepo(AbstractTagRepo):
@@ -34,18 +36,25 @@ class PostgresTagRepo(AbstractTagRepo):
 
     async def create_tag(self, tag_name: str) -> Tag:
         """
-        Create a new tag.
+        Create a new tag. Tag is inserted with INSERT ... ON CONFLICT DO NOTHING,
+        so existing name is detected without a separate lookup.
 
         :param tag_name: name of tag to create
         :type tag_name: str
         :return: created tag
         :rtype: Tag
+        :raise: ConflictError if tag with this name already exists
         """
         tag_name = tag_name.strip().lower()
-        tag = Tag(name=tag_name)
-        self.db.add(tag)
+        tag = self.db.scalars(
+            insert_for(self.db, Tag)
+            .values(name=tag_name)
+            .on_conflict_do_nothing(index_elements=[Tag.name])
+            .returning(Tag)
+        ).one_or_none()
+        if tag is None:
+            raise ConflictError(detail=TAG_ALREADY_EXISTS)
         self.db.commit()
-        self.db.refresh(tag)
         return tag
 
     async def get_tags(
@@ -123,3 +132,18 @@ class PostgresTagRepo(AbstractTagRepo):
         self.db.delete(tag)
         self.db.commit()
         return tag
+
+    async def get_tag_photo_ids(self, tag_id: int) -> list[int]:
+        """
+        Gets ids of photos linked to tag
+
+        :param tag_id: id of tag
+        :type tag_id: int
+        :return: ids of photos linked to tag
+        :rtype: list[int]
+        """
+        return list(
+            self.db.scalars(
+                select(photo_m2m_tag.c.photo_id).where(photo_m2m_tag.c.tag_id == tag_id)
+            )
+        )
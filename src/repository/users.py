@@ -1,15 +1,12 @@
-from datetime import datetime, timedelta
 from typing import Type
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import func, case, or_, select, union
 
 from src.repository.abstract import AbstractUserRepo
-from src.schemas.users import UserIn, ActiveStatus, UserRoleIn
-from src.database.models import User, RefreshToken, LogoutAccessToken
+from src.schemas.users import UserIn, UserUpdate, ActiveStatus, UserRoleIn
+from src.database.models import User, Photo, Comment, Rating
 from src.conf.constants import (
-    TOKEN_NOT_FOUND,
-    ACCESS_TOKEN_EXPIRE,
     USER_NOT_FOUND,
     ROLE_ADMIN,
     ROLE_MODERATOR,
@@ -53,6 +50,30 @@ class PostgresUserRepo(AbstractUserRepo):
         """
         return self.db.query(User).filter(User.username == username).first()
 
+    async def email_or_username_exists(
+        self, email: str, username: str, exclude_id: int | None = None
+    ) -> tuple[bool, bool]:
+        """
+        Checks in one query if users with provided email or username exist in database
+
+        :param email: email to check
+        :type email: str
+        :param username: username to check
+        :type username: str
+        :param exclude_id: id of user to skip in the check, e.g. user who is updating own data
+        :type exclude_id: int | None
+        :return: tuple (email taken, username taken)
+        :rtype: tuple[bool, bool]
+        """
+        query = self.db.query(
+            func.max(case((User.email == email, 1), else_=0)),
+            func.max(case((User.username == username, 1), else_=0)),
+        ).filter(or_(User.email == email, User.username == username))
+        if exclude_id is not None:
+            query = query.filter(User.id != exclude_id)
+        email_taken, username_taken = query.one()
+        return bool(email_taken), bool(username_taken)
+
     async def get_user_by_id(self, user_id: int) -> User:
         """
         Returns user from database based on provided user id
@@ -68,18 +89,29 @@ class PostgresUserRepo(AbstractUserRepo):
             raise NotFoundError(detail=USER_NOT_FOUND)
         return user
 
-    async def get_users(self, skip, limit) -> list[Type[User]]:
+    async def get_users(
+        self, after_id: int | None, limit: int, fields: list[str] | None = None
+    ) -> list[Type[User]]:
         """
-        Returns users from database
+        Returns users from database using keyset pagination on user id
 
-        :param skip: number of users to skip
-        :type skip: int
+        :param after_id: id of the last user from the previous page (None for the first page)
+        :type after_id: int | None
         :param limit: number of users to return
         :type limit: int
-        :return: list of users
+        :param fields: names of user columns to select, whole users are returned if None
+        :type fields: list[str] | None
+        :return: list of users, or rows with only the selected columns if fields are given
         :rtype: list[User]
         """
-        return self.db.query(User).offset(skip).limit(limit).all()
+        columns = [getattr(User, field) for field in fields] if fields else [User]
+        return (
+            self.db.query(*columns)
+            .filter(User.id > (after_id or 0))
+            .order_by(User.id)
+            .limit(limit)
+            .all()
+        )
 
     async def create_user(self, user: UserIn, avatar: str) -> User:
         """
@@ -135,12 +167,12 @@ class PostgresUserRepo(AbstractUserRepo):
         self.db.refresh(new_admin)
         return new_admin
 
-    async def update_user(self, new_user_data: UserIn, user_id: int) -> User:
+    async def update_user(self, new_user_data: UserUpdate, user_id: int) -> User:
         """
-        Updates user in database
+        Updates user in database. Password is changed only if new (hashed) password is provided.
 
         :param new_user_data: new user data
-        :type new_user_data: UserIn
+        :type new_user_data: UserUpdate
         :param user_id: id of user to update
         :type user_id: int
         :return: updated user
@@ -149,11 +181,27 @@ class PostgresUserRepo(AbstractUserRepo):
         user = await self.get_user_by_id(user_id)
         user.username = new_user_data.username
         user.email = new_user_data.email
-        user.password = new_user_data.password
+        if new_user_data.password is not None:
+            user.password = new_user_data.password
         self.db.commit()
         self.db.refresh(user)
         return user
 
+    async def update_user_password(self, user_id: int, hashed_password: str) -> None:
+        """
+        Updates user password hash in database
+
+        :param user_id: id of user to update password
+        :type user_id: int
+        :param hashed_password: new password hash
+        :type hashed_password: str
+        :return: None
+        """
+        self.db.query(User).filter(User.id == user_id).update(
+            {User.password: hashed_password}, synchronize_session=False
+        )
+        self.db.commit()
+
     async def update_user_avatar(self, user_id: int, new_avatar_url: str) -> User:
         """
         Updates user avatar in database
@@ -185,101 +233,23 @@ class PostgresUserRepo(AbstractUserRepo):
         self.db.commit()
         return user
 
-    async def add_refresh_token(
-        self,
-        user_id: int,
-        token: str | None,
-        expiration_date: datetime,
-        session_id: str,
-    ) -> None:
+    async def get_user_photo_ids(self, user_id: int) -> list[int]:
         """
-        Adds refresh token to database
+        Gets ids of photos uploaded, commented or rated by user
 
-        :param user_id: id of user to add refresh token
+        :param user_id: id of user
         :type user_id: int
-        :param token: refresh token
-        :type token: str
-        :param expiration_date: expiration date of refresh token
-        :type expiration_date: datetime
-        :param session_id: id of current session
-        :type session_id: str
-        :return: None
-        """
-        refresh_token = RefreshToken(
-            refresh_token=token,
-            user_id=user_id,
-            session_id=session_id,
-            expires_at=expiration_date,
-        )
-        self.db.add(refresh_token)
-        self.db.commit()
-
-    async def delete_refresh_token(self, token: str, user_id: int) -> None:
-        """
-        Deletes refresh token from database
-
-        :param token: token to delete
-        :type token: str
-        :param user_id: id of user who token belongs to
-        :type user_id: int
-        :return: None
-        """
-        old_token = (
-            self.db.query(RefreshToken)
-            .filter(
-                and_(
-                    RefreshToken.refresh_token == token, RefreshToken.user_id == user_id
+        :return: ids of photos linked to user
+        :rtype: list[int]
+        """
+        return list(
+            self.db.scalars(
+                union(
+                    select(Photo.id).where(Photo.user_id == user_id),
+                    select(Comment.photo_id).where(Comment.user_id == user_id),
+                    select(Rating.photo_id).where(Rating.user_id == user_id),
                 )
             )
-            .first()
-        )
-        if old_token is None:
-            raise NotFoundError(detail=TOKEN_NOT_FOUND)
-        self.db.delete(old_token)
-        self.db.commit()
-
-    async def logout_user(self, token: str, session_id: str, user: User) -> User:
-        """
-        Saves user logout data in database
-
-        :param token: user refresh token to save
-        :type token: str
-        :param session_id: current session id to save
-        :type session_id: str
-        :param user: user to logout
-        :return: logged-out user
-        """
-        refresh_token = (
-            self.db.query(RefreshToken)
-            .filter(
-                RefreshToken.session_id == session_id, RefreshToken.user_id == user.id
-            )
-            .first()
-        )
-        if refresh_token is None:
-            raise NotFoundError(detail=TOKEN_NOT_FOUND)
-        self.db.delete(refresh_token)
-        logout_access_token = LogoutAccessToken(
-            logout_access_token=token,
-            expires_at=datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE),
-        )
-        self.db.add(logout_access_token)
-        self.db.commit()
-        return user
-
-    async def is_user_logout(self, token: str) -> bool:
-        """
-        Checks if user is logged out
-
-        :param token: user refresh token to check
-        :type token: str
-        :return: LogoutAccessToken if user is logged out (means True), None otherwise (means False)
-        :rtype: bool
-        """
-        return (
-            self.db.query(LogoutAccessToken)
-            .filter(LogoutAccessToken.logout_access_token == token)
-            .first()
         )
 
     async def set_user_active_status(
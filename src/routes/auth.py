@@ -2,12 +2,23 @@
 Authentication routes
 """
 
-from fastapi import APIRouter, HTTPException, status, Security, Depends
+import time
+from datetime import timedelta
+
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    status,
+    Security,
+    Depends,
+    BackgroundTasks,
+)
 from fastapi.security import (
     OAuth2PasswordRequestForm,
     HTTPAuthorizationCredentials,
     HTTPBearer,
 )
+from fastapi.responses import ORJSONResponse
 
 from src.repository.abstract import AbstractUserRepo
 from src.database.dependencies import (
@@ -27,35 +38,34 @@ from src.conf.constants import (
     USER_NOT_FOUND,
     RATE_LIMITER_INFO,
     RATE_LIMITER,
+    LOG_IN_AGAIN,
+    REFRESH_TOKEN_EXPIRE,
 )
 from src.schemas.users import UserInfo, UserIn, UserDb, TokenModel
 from src.database.models import User
-from src.conf.errors import NotFoundError, ConflictError
+from src.conf.errors import NotFoundError, ConflictError, UnauthorizedError
 
-router = APIRouter(prefix=AUTH, tags=["auth"])
+router = APIRouter(prefix=AUTH, tags=["auth"], default_response_class=ORJSONResponse)
 security = HTTPBearer()
 
 
-async def __set_tokens(user: User, user_repo: AbstractUserRepo) -> TokenModel:
+async def __set_tokens(user: User) -> TokenModel:
     """
     This helping function is used to create access and refresh tokens for a user.
+    Tokens are stateless JWTs - revocation and single use of refresh tokens are handled by the Redis blacklist,
+    so issuing them needs no database write.
 
     :param user: user to create tokens for
     :type user: User
-    :param user_repo: repository to work with
-    :type user_repo: AbstractUserRepo
     :return: tokens
     :rtype: TokenModel
     """
     access_token, session_id = await auth_service.create_access_token(
         data={"sub": user.email}
     )
-    refresh_token, expiration_date = await auth_service.create_refresh_token(
+    refresh_token, _ = await auth_service.create_refresh_token(
         data={"sub": user.email, "session_id": session_id}
     )
-    await user_repo.add_refresh_token(
-        user.id, refresh_token, expiration_date, session_id
-    )
     return TokenModel(access_token=access_token, refresh_token=refresh_token)
 
 
@@ -87,18 +97,26 @@ async def signup(
     :rtype: UserInfo
     :raise: ConflictError: if account with this email or username already exists
     """
-    if await user_repo.get_user_by_email(user.email):
+    email_taken, username_taken = await user_repo.email_or_username_exists(
+        user.email, user.username
+    )
+    if email_taken:
         raise ConflictError(
             detail="Account with this email already exists",
         )
-    if await user_repo.get_user_by_username(user.username):
+    if username_taken:
         raise ConflictError(
             detail="Account with this username already exists",
         )
-    user.password = password_handler.get_password_hash(user.password)
+    user.password = await password_handler.get_password_hash(user.password)
     avatar = avatar_provider.get_avatar(user.email, 255)
     user = await user_repo.create_user(user, avatar)
-    return UserInfo(user=UserDb.model_validate(user), detail=USER_CREATED)
+    await auth_service.delete_unknown_email(user.email)
+    user_info = UserInfo(user=UserDb.model_validate(user), detail=USER_CREATED)
+    return ORJSONResponse(
+        content=user_info.model_dump(mode="json"),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.post(
@@ -118,6 +136,7 @@ async def login(
 ):
     """
     This endpoint is used to login a user.
+    Emails not found in database are cached in Redis for a short time, so repeated attempts skip the database.
 
     :param body: password and username from request body
     :type body: OAuth2PasswordRequestForm
@@ -131,13 +150,19 @@ async def login(
         HTTPException(status_code=401, detail="Incorrect username or password") if username or password is incorrect
         HTTPException(status_code=403, detail="User is banned") if user is banned
     """
+    if await auth_service.is_unknown_email(body.username):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=INCORRECT_USERNAME_OR_PASSWORD,
+        )
     user = await user_repo.get_user_by_email(body.username)
     if not user:
+        await auth_service.set_unknown_email(body.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=INCORRECT_USERNAME_OR_PASSWORD,
         )
-    if not password_handler.verify_password(body.password, user.password):
+    if not await password_handler.verify_password(body.password, user.password):
         # incorrect password
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -148,7 +173,12 @@ async def login(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=BANNED_USER,
         )
-    return await __set_tokens(user, user_repo)
+    if password_handler.needs_rehash(user.password):
+        # migrate legacy or outdated hash while the plain password is known
+        await user_repo.update_user_password(
+            user.id, await password_handler.get_password_hash(body.password)
+        )
+    return await __set_tokens(user)
 
 
 @router.post(
@@ -157,27 +187,32 @@ async def login(
     response_model=UserInfo,
 )
 async def logout(
-    current_user: User = Depends(auth_service.get_current_user),
+    background_tasks: BackgroundTasks,
+    current_user: UserDb = Depends(auth_service.get_current_user),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    user_repo: AbstractUserRepo = Depends(get_user_repository),
 ):
     """
     This endpoint is used to logout current user from current session.
+    The session is put on the Redis blacklist, which revokes both its access and refresh tokens.
+    Clearing the user cache runs as a background task.
 
+    :param background_tasks: tasks to run after the response is sent
+    :type background_tasks: BackgroundTasks
     :param current_user: user to logout
-    :type current_user: User
+    :type current_user: UserDb
     :param credentials: credentials for current user
     :type credentials: HTTPAuthorizationCredentials
-    :param user_repo: repository to work with
-    :type user_repo: AbstractUserRepo
     :return: info about the logout user
     :rtype: UserInfo
     """
     token = credentials.credentials
     session_id = await auth_service.get_session_id_from_token(token, current_user.email)
-    user = await user_repo.logout_user(token, session_id, current_user)
-    await auth_service.delete_user_from_redis(user.email)
-    return UserInfo(user=UserDb.model_validate(user), detail=USER_LOGOUT)
+    await auth_service.blacklist_token(
+        session_id, int(timedelta(days=REFRESH_TOKEN_EXPIRE).total_seconds())
+    )
+    background_tasks.add_task(auth_service.delete_user_from_redis, current_user.email)
+    user_info = UserInfo(user=UserDb.model_validate(current_user), detail=USER_LOGOUT)
+    return ORJSONResponse(content=user_info.model_dump(mode="json"))
 
 
 @router.get(
@@ -199,11 +234,18 @@ async def refresh_token(
     :type user_repo: AbstractUserRepo
     :return: tokens for user
     :rtype: TokenModel
+    :raise: UnauthorizedError if refresh token was already used or its session is logged out
     """
     old_refresh_token = credentials.credentials
-    email = await auth_service.decode_refresh_token(old_refresh_token)
-    user = await user_repo.get_user_by_email(email)
+    payload = await auth_service.decode_refresh_token(old_refresh_token)
+    if await auth_service.is_token_blacklisted(payload["session_id"]):
+        raise UnauthorizedError(detail=LOG_IN_AGAIN)
+    user = await user_repo.get_user_by_email(payload["sub"])
     if not user:
         raise NotFoundError(detail=USER_NOT_FOUND)
-    await user_repo.delete_refresh_token(old_refresh_token, user.id)
-    return await __set_tokens(user, user_repo)
+    # refresh token can be used only once - blacklist it until it expires
+    if not await auth_service.blacklist_token(
+        payload["jti"], payload["exp"] - int(time.time())
+    ):
+        raise UnauthorizedError(detail=LOG_IN_AGAIN)
+    return await __set_tokens(user)
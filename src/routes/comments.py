@@ -2,16 +2,18 @@ from fastapi import APIRouter, Depends, status
 from fastapi_limiter.depends import RateLimiter
 
 from src.conf.errors import ForbiddenError
-from src.database.dependencies import get_comment_repository, get_photo_repository
+from src.database.dependencies import get_comment_repository, get_cache
 from src.services.auth import auth_service
-from src.repository.abstract import AbstractCommentRepo, AbstractPhotoRepo
+from src.services.abstract import AbstractCache
+from src.services.cache import photo_cache_key
+from src.repository.abstract import AbstractCommentRepo
 from src.conf.constants import (
     COMMENTS,
     COMMENT_CREATED,
     COMMENT_UPDATED,
     FORBIDDEN_FOR_USER,
     ROLE_ADMIN,
-    ROLE_MODERATOR,
+    STAFF_ROLES,
     COMMENT_DELETED,
     RATE_LIMITER,
     RATE_LIMITER_INFO,
@@ -32,8 +34,8 @@ router = APIRouter(prefix=COMMENTS, tags=["comments"])
 async def create_comment(
     comment: CommentIn,
     current_user: UserDb = Depends(auth_service.get_current_user),
-    photo_repo: AbstractPhotoRepo = Depends(get_photo_repository),
     comment_repo: AbstractCommentRepo = Depends(get_comment_repository),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     Create a new comment.
@@ -42,17 +44,17 @@ async def create_comment(
     :type comment: CommentIn
     :param current_user: user who created comment
     :type current_user: UserDb
-    :param photo_repo: repository for photos
-    :type photo_repo: AbstractPhotoRepo
     :param comment_repo: repository for comments
     :type comment_repo: AbstractCommentRepo
+    :param cache: cache of serialized photos to clear
+    :type cache: AbstractCache
     :return: new comment with confirmation of creation
     :rtype: CommentInfo
     """
-    await photo_repo.get_photo_by_id(comment.photo_id)  # to check if photo exists
     comment = await comment_repo.create_comment(
         comment.content, comment.photo_id, current_user.id
     )
+    await cache.delete(photo_cache_key(comment.photo_id))
     return CommentInfo(
         comment=CommentOut.model_validate(comment), detail=COMMENT_CREATED
     )
@@ -67,7 +69,6 @@ async def get_comments(
     photo_id: int,
     current_user: UserDb = Depends(auth_service.get_current_user),
     comment_repo: AbstractCommentRepo = Depends(get_comment_repository),
-    photo_repo: AbstractPhotoRepo = Depends(get_photo_repository),
 ):
     """
     Get all comments for a photo.
@@ -78,14 +79,10 @@ async def get_comments(
     :type current_user: UserDb
     :param comment_repo: repository for comments
     :type comment_repo: AbstractCommentRepo
-    :param photo_repo: repository for photos
-    :type photo_repo: AbstractPhotoRepo
     :return: list of comments
     :rtype: list[CommentOut]
     """
-    await photo_repo.get_photo_by_id(photo_id)  # to check if photo exists
-    comments = await comment_repo.get_comments(photo_id)
-    return [CommentOut.model_validate(comment) for comment in comments]
+    return await comment_repo.get_comments(photo_id)
 
 
 @router.get(
@@ -110,8 +107,7 @@ async def get_comment(
     :return: comment
     :rtype: CommentOut
     """
-    comment = await comment_repo.get_comment_by_id(comment_id)
-    return CommentOut.model_validate(comment)
+    return await comment_repo.get_comment_by_id(comment_id)
 
 
 @router.patch(
@@ -124,6 +120,7 @@ async def update_comment(
     comment: CommentUpdate,
     current_user: UserDb = Depends(auth_service.get_current_user),
     comment_repo: AbstractCommentRepo = Depends(get_comment_repository),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     Update a comment.
@@ -136,12 +133,15 @@ async def update_comment(
     :type current_user: UserDb
     :param comment_repo: repository for comments
     :type comment_repo: AbstractCommentRepo
+    :param cache: cache of serialized photos to clear
+    :type cache: AbstractCache
     :return: updated comment with confirmation of update
     :rtype: CommentInfo
     """
     comment = await comment_repo.update_comment(
         comment_id, current_user.id, comment.content
     )
+    await cache.delete(photo_cache_key(comment.photo_id))
     return CommentInfo(
         comment=CommentOut.model_validate(comment), detail=COMMENT_UPDATED
     )
@@ -156,6 +156,7 @@ async def delete_comment(
     comment_id: int,
     current_user: UserDb = Depends(auth_service.get_current_user),
     comment_repo: AbstractCommentRepo = Depends(get_comment_repository),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     Delete a comment - allow only for admin and moderator.
@@ -166,12 +167,15 @@ async def delete_comment(
     :type current_user: UserDb
     :param comment_repo: repository for comments
     :type comment_repo: AbstractCommentRepo
+    :param cache: cache of serialized photos to clear
+    :type cache: AbstractCache
     :return: deleted comment with confirmation of deletion
     :rtype: CommentInfo
     """
-    if current_user.role not in [ROLE_ADMIN, ROLE_MODERATOR]:
+    if current_user.role not in STAFF_ROLES:
         raise ForbiddenError(detail=FORBIDDEN_FOR_USER)
     comment = await comment_repo.delete_comment(comment_id)
+    await cache.delete(photo_cache_key(comment.photo_id))
     return CommentInfo(
         comment=CommentOut.model_validate(comment), detail=COMMENT_DELETED
     )
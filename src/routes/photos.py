@@ -1,13 +1,17 @@
+import hashlib
+
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     UploadFile,
     File,
     HTTPException,
     status,
     Query,
+    Request,
+    Response,
 )
-from fastapi.responses import StreamingResponse
 from fastapi_limiter.depends import RateLimiter
 
 from src.conf.errors import ForbiddenError, NotFoundError
@@ -16,6 +20,7 @@ from src.schemas.photos import (
     PhotoOut,
     PhotoIn,
     PhotoInfo,
+    PhotoCursor,
     TransformIn,
     RatingIn,
     RatingOut,
@@ -23,17 +28,22 @@ from src.schemas.photos import (
 )
 from src.services.auth import auth_service
 from src.repository.abstract import AbstractPhotoRepo
-from src.services.abstract import AbstractPhotoStorageProvider, AbstractQrCodeProvider
+from src.services.abstract import (
+    AbstractPhotoStorageProvider,
+    AbstractQrCodeProvider,
+    AbstractCache,
+)
+from src.services.cache import photo_cache_key
 from src.database.dependencies import (
     get_photo_repository,
     get_photo_storage_provider,
     get_qr_code_provider,
+    get_cache,
 )
 from src.conf.constants import (
     PHOTOS,
-    PHOTO_SEARCH_ENUMS,
+    PhotoSortType,
     FORBIDDEN_FOR_NOT_OWNER,
-    INVALID_SORT_TYPE,
     RATING_DELETED,
     PHOTO_CREATED,
     PHOTO_DELETED,
@@ -41,6 +51,10 @@ from src.conf.constants import (
     PHOTO_RATED,
     RATE_LIMITER,
     RATE_LIMITER_INFO,
+    QR_CODE_CACHE_CONTROL,
+    INVALID_CURSOR,
+    NEXT_CURSOR_HEADER,
+    PHOTO_CACHE_EXPIRE,
 )
 
 router = APIRouter(prefix=PHOTOS, tags=["photos"])
@@ -54,46 +68,65 @@ router = APIRouter(prefix=PHOTOS, tags=["photos"])
     response_model=list[PhotoOut],
 )
 async def get_photos(
+    response: Response,
     query: str | None = Query(
         None, description="Search by keywords in description or tags"
     ),
     user_id: int | None = None,
-    sort_by: str | None = Query(
+    sort_by: PhotoSortType | None = Query(
         None,
-        enum=PHOTO_SEARCH_ENUMS,
         description="Sort by date or rating",
     ),
     current_user: UserDb = Depends(auth_service.get_current_user),
     photo_repo: AbstractPhotoRepo = Depends(get_photo_repository),
-    skip: int = 0,
+    cursor: str | None = Query(
+        None,
+        description=f"Cursor of the next page, returned in {NEXT_CURSOR_HEADER} header",
+    ),
+    skip: int = Query(0, deprecated=True),
     limit: int = 10,
 ):
     """
     This endpoint is used to get all or queried photos (paginated). Photos can be sorted by date or rating.
+    If there may be more photos, cursor of the next page is returned in the X-Next-Cursor header.
 
+    :param response: response to set next page cursor header on
+    :type response: Response
     :param query: query to search in description or tags (optional)
     :type query: str | None
     :param user_id: user id to filter by (optional)
     :type user_id: int | None
     :param sort_by: how to sort photos (optional)
-    :type sort_by: str | None
+    :type sort_by: PhotoSortType | None
     :param current_user: user who performed request
     :type current_user: UserDb
     :param photo_repo: repository to work with
     :type photo_repo: AbstractPhotoRepo
-    :param skip: number of photos to skip
+    :param cursor: cursor of the page to get (optional)
+    :type cursor: str | None
+    :param skip: number of photos to skip, ignored when cursor is given (deprecated, use cursor instead)
     :type skip: int
     :param limit: number of photos to get
     :type limit: int
     :return: list of photos
     :rtype: list[PhotoOut]
-    :raise: HTTPException 502 bad gateway if sort_by is not valid
+    :raise: HTTPException 422 unprocessable entity if cursor is malformed or was issued for another sort type
     """
-    if sort_by and sort_by not in PHOTO_SEARCH_ENUMS:
+    try:
+        photo_cursor = PhotoCursor.decode(cursor) if cursor else None
+        if photo_cursor and not photo_cursor.matches(sort_by):
+            raise ValueError(INVALID_CURSOR)
+    except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY, detail=INVALID_SORT_TYPE
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=INVALID_CURSOR
         )
-    photos = await photo_repo.get_photos(skip, limit, query, user_id, sort_by)
+    photos = await photo_repo.get_photos(
+        skip, limit, query, user_id, sort_by, photo_cursor
+    )
+    if photos and len(photos) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = PhotoCursor.from_photo(
+            photos[-1], sort_by
+        ).encode()
     return photos
 
 
@@ -150,9 +183,11 @@ async def get_photo(
     photo_id: int,
     current_user: UserDb = Depends(auth_service.get_current_user),
     photo_repo: AbstractPhotoRepo = Depends(get_photo_repository),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     This endpoint is used to get photo by id.
+    Serialized photo is cached for a short time and the cache is cleared whenever the photo changes.
 
     :param photo_id: id of photo to get
     :type photo_id: int
@@ -160,20 +195,27 @@ async def get_photo(
     :type current_user: UserDb
     :param photo_repo: repository to work with
     :type photo_repo: AbstractPhotoRepo
+    :param cache: cache of serialized photos
+    :type cache: AbstractCache
     :return: photo
     :rtype: PhotoOut
     """
-    photo = await photo_repo.get_photo_by_id(photo_id)
-    return photo
+    cached_photo = await cache.get(photo_cache_key(photo_id))
+    if cached_photo is None:
+        photo = await photo_repo.get_photo_by_id(photo_id)
+        cached_photo = PhotoOut.model_validate(photo).model_dump_json()
+        await cache.set(photo_cache_key(photo_id), cached_photo, PHOTO_CACHE_EXPIRE)
+    return Response(content=cached_photo, media_type="application/json")
 
 
 @router.get(
     "/{photo_id}/qr_code",
     description=f"This endpoint is used to get photo qr code. {RATE_LIMITER_INFO}",
     dependencies=[Depends(RATE_LIMITER)],
-    response_class=StreamingResponse,
+    response_class=Response,
 )
 async def get_qr_code(
+    request: Request,
     photo_id: int,
     transform_id: int | None = Query(
         None,
@@ -185,7 +227,11 @@ async def get_qr_code(
 ):
     """
     This endpoint is used to get photo or one of it transformation qr code.
+    QR code is deterministic for given url, so response is marked as immutable
+    and conditional request with matching ETag gets 304 Not Modified.
 
+    :param request: request object to read If-None-Match header from
+    :type request: Request
     :param photo_id: id of photo to get
     :type photo_id: int
     :param transform_id: transformation id to get qr code of (optional)
@@ -196,8 +242,8 @@ async def get_qr_code(
     :type photo_repo: AbstractPhotoRepo
     :param qr_code_provider: qr code provider to get qr code from it
     :type qr_code_provider: AbstractQrCodeProvider
-    :return: qr code
-    :rtype: StreamingResponse
+    :return: qr code or empty 304 response if client has it cached
+    :rtype: Response
     :raise: NotFoundError if no transformation found for given transformation id
     """
     photo = await photo_repo.get_photo_by_id(photo_id)
@@ -210,7 +256,13 @@ async def get_qr_code(
             )
     else:
         photo_url = photo.photo_url
-    return await qr_code_provider.stream_qr_code(photo_url)
+    etag = f'"{hashlib.blake2b(photo_url.encode(), digest_size=16).hexdigest()}"'
+    cache_headers = {"ETag": etag, "Cache-Control": QR_CODE_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    response = await qr_code_provider.stream_qr_code(photo_url)
+    response.headers.update(cache_headers)
+    return response
 
 
 @router.delete(
@@ -221,28 +273,36 @@ async def get_qr_code(
 )
 async def delete_photo(
     photo_id: int,
+    background_tasks: BackgroundTasks,
     current_user: UserDb = Depends(auth_service.get_current_user),
     photo_repo: AbstractPhotoRepo = Depends(get_photo_repository),
     photo_storage_provider: AbstractPhotoStorageProvider = Depends(
         get_photo_storage_provider
     ),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     This endpoint is used to delete photo by id.
+    Photo file is removed from the storage in background, after the response is sent.
 
     :param photo_id: id of photo to delete
     :type photo_id: int
+    :param background_tasks: background tasks to delete photo file from storage
+    :type background_tasks: BackgroundTasks
     :param current_user: user who performed request
     :type current_user: UserDb
     :param photo_repo: repository to work with
     :type photo_repo: AbstractPhotoRepo
     :param photo_storage_provider: photo storage provider to delete photo from it
     :type photo_storage_provider: AbstractPhotoStorageProvider
+    :param cache: cache of serialized photos to clear
+    :type cache: AbstractCache
     :return: deleted photo
     :rtype: PhotoInfo
     """
     photo = await photo_repo.delete_photo(photo_id, current_user.id, current_user.role)
-    await photo_storage_provider.delete_photo(photo.photo_url)
+    await cache.delete(photo_cache_key(photo_id))
+    background_tasks.add_task(photo_storage_provider.delete_photo, photo.photo_url)
     return PhotoInfo(photo=PhotoOut.model_validate(photo), detail=PHOTO_DELETED)
 
 
@@ -257,6 +317,7 @@ async def update_photo(
     photo_info: PhotoIn,
     current_user: UserDb = Depends(auth_service.get_current_user),
     photo_repo: AbstractPhotoRepo = Depends(get_photo_repository),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     This endpoint is used to update photo by id.
@@ -269,10 +330,13 @@ async def update_photo(
     :type current_user: UserDb
     :param photo_repo: repository to work with
     :type photo_repo: AbstractPhotoRepo
+    :param cache: cache of serialized photos to clear
+    :type cache: AbstractCache
     :return: updated photo
     :rtype: PhotoInfo
     """
     photo = await photo_repo.update_photo(photo_id, photo_info, current_user.id)
+    await cache.delete(photo_cache_key(photo_id))
     return PhotoInfo(photo=PhotoOut.model_validate(photo), detail=PHOTO_UPDATED)
 
 
@@ -290,6 +354,7 @@ async def transform_photo(
         get_photo_storage_provider
     ),
     photo_repo: AbstractPhotoRepo = Depends(get_photo_repository),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     This endpoint is used to transform photo by id.
@@ -304,6 +369,8 @@ async def transform_photo(
     :type photo_storage_provider: AbstractPhotoStorageProvider
     :param photo_repo: repository to work with
     :type photo_repo: AbstractPhotoRepo
+    :param cache: cache of serialized photos to clear
+    :type cache: AbstractCache
     :return: updated photo
     :rtype: PhotoInfo
     :raise: ForbiddenError if user who performs request is not owner of photo
@@ -314,9 +381,8 @@ async def transform_photo(
     transform_url, transform_params = await photo_storage_provider.transform_photo(
         photo.photo_url, transform
     )
-    photo = await photo_repo.add_transform_photo(
-        photo_id, transform_params, transform_url
-    )
+    photo = await photo_repo.add_transform_photo(photo, transform_params, transform_url)
+    await cache.delete(photo_cache_key(photo_id))
     return PhotoInfo(photo=PhotoOut.model_validate(photo), detail=PHOTO_UPDATED)
 
 
@@ -330,6 +396,7 @@ async def rate_photo(
     rating_in: RatingIn,
     current_user: UserDb = Depends(auth_service.get_current_user),
     photo_repo: AbstractPhotoRepo = Depends(get_photo_repository),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     This endpoint is used to rate or change previous photo rating.
@@ -342,10 +409,13 @@ async def rate_photo(
     :type current_user: UserDb
     :param photo_repo: repository to work with
     :type photo_repo: AbstractPhotoRepo
+    :param cache: cache of serialized photos to clear
+    :type cache: AbstractCache
     :return: new rating of photo
     :rtype: RatingInfo
     """
     rating = await photo_repo.rate_photo(photo_id, rating_in, current_user.id)
+    await cache.delete(photo_cache_key(photo_id))
     return RatingInfo(rating=RatingOut.model_validate(rating), detail=PHOTO_RATED)
 
 
@@ -358,6 +428,7 @@ async def delete_rating(
     photo_id: int,
     current_user: UserDb = Depends(auth_service.get_current_user),
     photo_repo: AbstractPhotoRepo = Depends(get_photo_repository),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     This endpoint is used to delete photo rating.
@@ -368,8 +439,11 @@ async def delete_rating(
     :type current_user: UserDb
     :param photo_repo: repository to work with
     :type photo_repo: AbstractPhotoRepo
+    :param cache: cache of serialized photos to clear
+    :type cache: AbstractCache
     :return: deleted rating
     :rtype: RatingInfo
     """
     rating = await photo_repo.delete_rating(photo_id, current_user.id)
+    await cache.delete(photo_cache_key(photo_id))
     return RatingInfo(rating=RatingOut.model_validate(rating), detail=RATING_DELETED)
@@ -1,21 +1,22 @@
 from fastapi import APIRouter, Depends, status, Query
 from fastapi_limiter.depends import RateLimiter
 
-from src.conf.errors import ForbiddenError, ConflictError
-from src.database.dependencies import get_tag_repository
+from src.conf.errors import ForbiddenError
+from src.database.dependencies import get_tag_repository, get_cache
 from src.schemas.tags import TagIn, TagInfo, TagOut
 from src.schemas.users import UserDb
 from src.services.auth import auth_service
 from src.repository.abstract import AbstractTagRepo
+from src.services.abstract import AbstractCache
+from src.services.cache import photo_cache_key
 from src.conf.constants import (
     TAGS,
     TAG_CREATED,
-    TAG_ALREADY_EXISTS,
     TAG_UPDATED,
     TAG_DELETED,
     FORBIDDEN_FOR_USER,
     ROLE_ADMIN,
-    ROLE_MODERATOR,
+    STAFF_ROLES,
     TAGS_GET_ENUM,
     FORBIDDEN_FOR_USER_AND_MODERATOR,
     RATE_LIMITER,
@@ -48,11 +49,9 @@ async def create_tag(
     :type tag_repo: AbstractTagRepo
     :return: confirmation of creation with tag info
     :rtype: TagInfo
+    :raise: ConflictError if tag already exists
     """
-    tag_name = tag_in.name.strip().lower()
-    if await tag_repo.get_tag_by_name(tag_name):
-        raise ConflictError(detail=TAG_ALREADY_EXISTS)
-    tag = await tag_repo.create_tag(tag_name)
+    tag = await tag_repo.create_tag(tag_in.name)
     return TagInfo(tag=TagOut.model_validate(tag), detail=TAG_CREATED)
 
 
@@ -88,8 +87,7 @@ async def get_tags(
     :return: list of tags
     :rtype: list[TagOut]
     """
-    tags = await tag_repo.get_tags(sort_by, skip, limit)
-    return [TagOut.model_validate(tag) for tag in tags]
+    return await tag_repo.get_tags(sort_by, skip, limit)
 
 
 @router.get(
@@ -128,6 +126,7 @@ async def update_tag(
     tag_in: TagIn,
     current_user: UserDb = Depends(auth_service.get_current_user),
     tag_repo: AbstractTagRepo = Depends(get_tag_repository),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     Update tag by id. Only admin or moderator can update tags.
@@ -140,12 +139,16 @@ async def update_tag(
     :type current_user: UserDb
     :param tag_repo: repository for tags
     :type tag_repo: AbstractTagRepo
+    :param cache: cache of serialized responses
+    :type cache: AbstractCache
     :return: updated tag
     :rtype: TagInfo
     """
-    if current_user.role not in [ROLE_ADMIN, ROLE_MODERATOR]:
+    if current_user.role not in STAFF_ROLES:
         raise ForbiddenError(detail=FORBIDDEN_FOR_USER)
     tag = await tag_repo.update_tag(tag_id, tag_in.name)
+    photo_ids = await tag_repo.get_tag_photo_ids(tag_id)
+    await cache.delete(*map(photo_cache_key, photo_ids))
     return TagInfo(tag=TagOut.model_validate(tag), detail=TAG_UPDATED)
 
 
@@ -158,6 +161,7 @@ async def delete_tag(
     tag_id: int,
     current_user: UserDb = Depends(auth_service.get_current_user),
     tag_repo: AbstractTagRepo = Depends(get_tag_repository),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     Delete tag by id. Only admin can delete tags.
@@ -168,10 +172,14 @@ async def delete_tag(
     :type current_user: UserDb
     :param tag_repo: repository for tags
     :type tag_repo: AbstractTagRepo
+    :param cache: cache of serialized responses
+    :type cache: AbstractCache
     :return: confirmation of deletion with deleted tag
     :rtype: TagInfo
     """
     if current_user.role != ROLE_ADMIN:
         raise ForbiddenError(detail=FORBIDDEN_FOR_USER_AND_MODERATOR)
+    photo_ids = await tag_repo.get_tag_photo_ids(tag_id)
     tag = await tag_repo.delete_tag(tag_id)
+    await cache.delete(*map(photo_cache_key, photo_ids))
     return TagInfo(tag=TagOut.model_validate(tag), detail=TAG_DELETED)
@@ -1,15 +1,34 @@
-from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Query
+import hashlib
+from operator import attrgetter
+
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    status,
+    UploadFile,
+    File,
+    Query,
+    BackgroundTasks,
+    Request,
+    Response,
+)
+from pydantic import BaseModel
 
 from src.services.auth import auth_service
 from src.database.dependencies import (
     get_user_repository,
     get_password_handler,
     get_photo_storage_provider,
+    get_cache,
 )
 from src.conf.constants import (
     USERS,
     ROLE_ADMIN,
     ROLE_MODERATOR,
+    STAFF_ROLES,
+    USER_CACHE_CONTROL,
+    NEXT_CURSOR_HEADER,
     FORBIDDEN_FOR_USER,
     FORBIDDEN_FOR_USER_AND_MODERATOR,
     USERNAME_EXISTS,
@@ -22,21 +41,47 @@ from src.conf.constants import (
 )
 from src.schemas.users import (
     UserDb,
-    UserIn,
+    UserUpdate,
     ActiveStatus,
     UserInfo,
     UserRoleIn,
     UserPublic,
     UserModeratorView,
 )
-from src.database.models import User
 from src.repository.abstract import AbstractUserRepo
-from src.services.abstract import AbstractPasswordHandler, AbstractPhotoStorageProvider
+from src.services.abstract import (
+    AbstractPasswordHandler,
+    AbstractPhotoStorageProvider,
+    AbstractCache,
+)
+from src.services.cache import photo_cache_key
 
 from src.conf.errors import ForbiddenError
 
 router = APIRouter(prefix=USERS, tags=["users"])
 
+USER_VIEWS = {ROLE_ADMIN: UserDb, ROLE_MODERATOR: UserModeratorView}
+
+
+def __construct_views(view: type[BaseModel], users: list) -> list[BaseModel]:
+    """
+    This helping function is used to build user views from trusted database rows without pydantic validation.
+    Response is still checked once against the endpoint response model.
+
+    :param view: user view model to build
+    :type view: type[BaseModel]
+    :param users: users from database
+    :type users: list[User] | list[Row]
+    :return: user views
+    :rtype: list[BaseModel]
+    """
+    fields = tuple(view.model_fields)
+    construct = view.model_construct
+    if len(fields) == 1:
+        return [construct(**{fields[0]: getattr(user, fields[0])}) for user in users]
+    get_values = attrgetter(*fields)
+    return [construct(**dict(zip(fields, get_values(user)))) for user in users]
+
 
 @router.get(
     "/",
@@ -46,20 +91,28 @@ router = APIRouter(prefix=USERS, tags=["users"])
     response_model=list[UserDb] | list[UserModeratorView] | list[UserPublic],
 )
 async def get_users(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1),
-    current_user: User = Depends(auth_service.get_current_user),
+    response: Response,
+    after_id: int | None = Query(
+        None,
+        ge=0,
+        description=f"Id of the last user of the previous page, returned in {NEXT_CURSOR_HEADER} header",
+    ),
+    limit: int = Query(10, ge=1, le=100),
+    current_user: UserDb = Depends(auth_service.get_current_user),
     user_repo: AbstractUserRepo = Depends(get_user_repository),
 ):
     """
     This endpoint is used to get all users with pagination. Depending on the user role, the endpoint will return different data views.
+    If the page is full, id to request the next page with is returned in the X-Next-Cursor header.
 
-    :param skip: number of users to skip
-    :type skip: int
+    :param response: response to set next page cursor header on
+    :type response: Response
+    :param after_id: id of the last user from the previous page (None for the first page)
+    :type after_id: int | None
     :param limit: number of users to return
     :type limit: int
     :param current_user: user who performed request
-    :type current_user: User
+    :type current_user: UserDb
     :param user_repo: repository to work with
     :type user_repo: AbstractUserRepo
     :return: users
@@ -67,12 +120,11 @@ async def get_users(
             list[UserModeratorView] if current_user role is moderator |
             list[UserPublic] if current_user role is standard
     """
-    users = await user_repo.get_users(skip, limit)
-    if current_user.role == ROLE_ADMIN:
-        return [UserDb.model_validate(user) for user in users]
-    elif current_user.role == ROLE_MODERATOR:
-        return [UserModeratorView.model_validate(user) for user in users]
-    return [UserPublic.model_validate(user) for user in users]
+    view = USER_VIEWS.get(current_user.role, UserPublic)
+    users = await user_repo.get_users(after_id, limit, list(view.model_fields))
+    if users and len(users) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(users[-1].id)
+    return __construct_views(view, users)
 
 
 @router.get(
@@ -83,48 +135,65 @@ async def get_users(
     response_model=UserDb | UserModeratorView | UserPublic,
 )
 async def get_user(
+    request: Request,
     user_id: int,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserDb = Depends(auth_service.get_current_user),
     user_repo: AbstractUserRepo = Depends(get_user_repository),
 ):
     """
     This endpoint is used to get user by id. Depending on the user role, the endpoint will return different data views.
+    Response has ETag computed from its content, so conditional request with matching ETag gets 304 Not Modified.
 
+    :param request: request object to read If-None-Match header from
+    :type request: Request
     :param user_id: id of user to get
     :type user_id: int
     :param current_user: user who performed request
-    :type current_user: User
+    :type current_user: UserDb
     :param user_repo: repository to work with
     :type user_repo: AbstractUserRepo
-    :return: user
-    :rtype: UserDb if current_user role is admin |
+    :return: user (UserDb if current_user role is admin |
             UserModeratorView if current_user role is moderator |
-            UserPublic if current_user role is standard
+            UserPublic if current_user role is standard)
+            or empty 304 response if client has it cached
+    :rtype: Response
     """
     user = await user_repo.get_user_by_id(user_id)
     if current_user.role == ROLE_ADMIN or current_user.id == user_id:
-        return UserDb.model_validate(user)
+        view = UserDb
     elif current_user.role == ROLE_MODERATOR:
-        return UserModeratorView.model_validate(user)
-    return UserPublic.model_validate(user)
+        view = UserModeratorView
+    else:
+        view = UserPublic
+    body = view.model_validate(user).model_dump_json().encode()
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    cache_headers = {
+        "ETag": etag,
+        "Cache-Control": USER_CACHE_CONTROL,
+        "Vary": "Authorization",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    return Response(content=body, media_type="application/json", headers=cache_headers)
 
 
 @router.patch(
     "/", description=f"This endpoint is used to update user.", response_model=UserInfo
 )
 async def update_user(
-    new_user_data: UserIn,
-    current_user: User = Depends(auth_service.get_current_user),
+    new_user_data: UserUpdate,
+    current_user: UserDb = Depends(auth_service.get_current_user),
     user_repo: AbstractUserRepo = Depends(get_user_repository),
     password_handler: AbstractPasswordHandler = Depends(get_password_handler),
 ):
     """
-    This endpoint is used to update user.
+    This endpoint is used to update user. Password is hashed and changed only if it is provided.
+    New email is removed from the not registered emails cache, so login with it works at once.
 
     :param new_user_data: new user data
-    :type new_user_data: UserIn
+    :type new_user_data: UserUpdate
     :param current_user: user who performed request
-    :type current_user: User
+    :type current_user: UserDb
     :param user_repo: repository to work with
     :type user_repo: AbstractUserRepo
     :param password_handler: password handler to work with
@@ -132,20 +201,26 @@ async def update_user(
     :return: updated user with confirmation message
     :rtype: UserInfo
     """
-    if new_user_data.username != current_user.username:
-        if await user_repo.get_user_by_username(new_user_data.username):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT, detail=USERNAME_EXISTS
-            )
-    if new_user_data.email != current_user.email:
-        if await user_repo.get_user_by_email(new_user_data.email):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT, detail=EMAIL_EXISTS
-            )
-    new_user_data.password = password_handler.get_password_hash(new_user_data.password)
-    user = await user_repo.update_user(new_user_data, current_user.id)
+    email_taken, username_taken = await user_repo.email_or_username_exists(
+        new_user_data.email, new_user_data.username, exclude_id=current_user.id
+    )
+    if username_taken:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=USERNAME_EXISTS
+        )
+    if email_taken:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=EMAIL_EXISTS)
+    if new_user_data.password is not None:
+        new_user_data.password = await password_handler.get_password_hash(
+            new_user_data.password
+        )
+    user = UserDb.model_validate(
+        await user_repo.update_user(new_user_data, current_user.id)
+    )
     await auth_service.update_user_in_redis(user.email, user)
-    return UserInfo(user=UserDb.model_validate(user), detail=USER_UPDATE)
+    if user.email != current_user.email:
+        await auth_service.delete_unknown_email(user.email)
+    return UserInfo(user=user, detail=USER_UPDATE)
 
 
 @router.patch(
@@ -155,8 +230,9 @@ async def update_user(
     response_model=UserInfo,
 )
 async def update_user_avatar(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserDb = Depends(auth_service.get_current_user),
     user_repo: AbstractUserRepo = Depends(get_user_repository),
     photo_storage_provider: AbstractPhotoStorageProvider = Depends(
         get_photo_storage_provider
@@ -164,11 +240,14 @@ async def update_user_avatar(
 ):
     """
     This endpoint is used to update user avatar.
+    Old avatar file is removed from the storage in background, after the response is sent.
 
+    :param background_tasks: background tasks to delete old avatar file from storage
+    :type background_tasks: BackgroundTasks
     :param file: new avatar file
     :type file: UploadFile
     :param current_user: user who performed request
-    :type current_user: User
+    :type current_user: UserDb
     :param user_repo: repository to work with
     :type user_repo: AbstractUserRepo
     :param photo_storage_provider: photo storage provider to work with
@@ -177,11 +256,15 @@ async def update_user_avatar(
     :rtype: UserInfo
     """
     new_avatar_url = await photo_storage_provider.upload_avatar(file)
-    if not current_user.avatar.startswith(DEFAULT_AVATAR_URL_START_V1_GRAVATAR):
-        await photo_storage_provider.delete_avatar(current_user.avatar)
-    user = await user_repo.update_user_avatar(current_user.id, new_avatar_url)
+    user = UserDb.model_validate(
+        await user_repo.update_user_avatar(current_user.id, new_avatar_url)
+    )
     await auth_service.update_user_in_redis(user.email, user)
-    return UserInfo(user=UserDb.model_validate(user), detail=USER_UPDATE)
+    if not current_user.avatar.startswith(DEFAULT_AVATAR_URL_START_V1_GRAVATAR):
+        background_tasks.add_task(
+            photo_storage_provider.delete_avatar, current_user.avatar
+        )
+    return UserInfo(user=user, detail=USER_UPDATE)
 
 
 @router.delete(
@@ -191,26 +274,32 @@ async def update_user_avatar(
 )
 async def delete_user(
     user_id: int,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserDb = Depends(auth_service.get_current_user),
     user_repo: AbstractUserRepo = Depends(get_user_repository),
+    cache: AbstractCache = Depends(get_cache),
 ):
     """
     This endpoint is used to delete user.
+    Cached photos uploaded, commented or rated by the user are cleared, as the delete cascades to them.
 
     :param user_id: id of user to delete
     :type user_id: int
     :param current_user: user who performed request
-    :type current_user: User
+    :type current_user: UserDb
     :param user_repo: repository to work with
     :type user_repo: AbstractUserRepo
+    :param cache: cache of serialized photos to clear
+    :type cache: AbstractCache
     :return: deleted user with confirmation message
     :rtype: UserInfo
     :raise: ForbiddenError if current_user role is not admin or user_id is not equal to current_user id
     """
     if current_user.role == ROLE_ADMIN or current_user.id == user_id:
         user = await user_repo.get_user_by_id(user_id)
+        photo_ids = await user_repo.get_user_photo_ids(user.id)
         user = await user_repo.delete_user(user.id)
         await auth_service.delete_user_from_redis(user.email)
+        await cache.delete(*map(photo_cache_key, photo_ids))
         return UserInfo(user=UserDb.model_validate(user), detail=USER_DELETE)
     else:
         raise ForbiddenError(detail=FORBIDDEN_FOR_USER_AND_MODERATOR)
@@ -224,7 +313,7 @@ async def delete_user(
 async def set_active_status(
     user_id: int,
     active_status: ActiveStatus,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserDb = Depends(auth_service.get_current_user),
     user_repo: AbstractUserRepo = Depends(get_user_repository),
 ):
     """
@@ -235,14 +324,14 @@ async def set_active_status(
     :param active_status: new active status
     :type active_status: ActiveStatus
     :param current_user: user who performed request
-    :type current_user: User
+    :type current_user: UserDb
     :param user_repo: repository to work with
     :type user_repo: AbstractUserRepo
     :return: updated user with confirmation message
     :rtype: UserInfo
     :raise: ForbiddenError if current_user role is not admin or moderator
     """
-    if current_user.role not in [ROLE_ADMIN, ROLE_MODERATOR]:
+    if current_user.role not in STAFF_ROLES:
         raise ForbiddenError(detail=FORBIDDEN_FOR_USER)
     user = await user_repo.set_user_active_status(user_id, active_status, current_user)
     return UserInfo(
@@ -259,7 +348,7 @@ async def set_active_status(
 async def set_role(
     user_id: int,
     role: UserRoleIn,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserDb = Depends(auth_service.get_current_user),
     user_repo: AbstractUserRepo = Depends(get_user_repository),
 ):
     """
@@ -270,7 +359,7 @@ async def set_role(
     :param role: new role
     :type role: UserRoleIn
     :param current_user: user who performed request
-    :type current_user: User
+    :type current_user: UserDb
     :param user_repo: repository to work with
     :type user_repo: AbstractUserRepo
     :return: updated user with confirmation message
@@ -279,8 +368,7 @@ async def set_role(
     """
     if current_user.role != ROLE_ADMIN:
         raise ForbiddenError(detail=FORBIDDEN_FOR_USER_AND_MODERATOR)
-    user = await user_repo.set_user_role(user_id, role)
+    db_user = await user_repo.set_user_role(user_id, role)
+    user = UserDb.model_validate(db_user)
     await auth_service.update_user_in_redis(user.email, user)
-    return UserInfo(
-        user=UserDb.model_validate(user), detail=f"User role set to {user.role}."
-    )
+    return UserInfo(user=user, detail=f"User role set to {db_user.role}.")
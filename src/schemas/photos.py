@@ -1,11 +1,13 @@
 from datetime import datetime
-import json
+import base64
 
 from pydantic import BaseModel, Field, model_validator, field_validator, ConfigDict
 
 from src.conf.constants import (
     MAX_DESCRIPTION_LENGTH,
     MAX_TAGS_AMOUNT,
+    TRANSFORM_EFFECTS,
+    PhotoSortType,
 )
 from src.schemas.tags import TagIn, TagOut
 from src.schemas.comments import CommentOut
@@ -28,13 +30,14 @@ class PhotoIn(BaseModel):
     @classmethod
     def validate_to_json(cls, value):
         """
-        Convert model to json if it is a string.
+        Convert model to json if it is a string. JSON string (sent as multipart form field)
+        is parsed and validated in a single pydantic-core pass.
 
         :param value: json or model
         :return: json model
         """
         if isinstance(value, str):
-            return cls(**json.loads(value))
+            return cls.model_validate_json(value)
         return value
 
     @field_validator("description")
@@ -45,11 +48,12 @@ class PhotoIn(BaseModel):
         :return: description of photo
         :raise: ValueError if description is too long or empty
         """
-        if len(description.strip()) > MAX_DESCRIPTION_LENGTH:
+        length = len(description.strip())
+        if length > MAX_DESCRIPTION_LENGTH:
             raise ValueError(
                 f"Description too long. Max description length is {MAX_DESCRIPTION_LENGTH}."
             )
-        if len(description.strip()) == 0:
+        if length == 0:
             raise ValueError("Description cannot be empty.")
         return description
 
@@ -68,10 +72,13 @@ class PhotoIn(BaseModel):
         return tags
 
 
-class PhotoOut(PhotoIn):
+class PhotoOut(BaseModel):
     """
     Photo model for returning photo from database.
+    Does not inherit from PhotoIn, so input validators are not run on data read from database.
 
+    :param description: description of photo
+    :type description: str
     :param id: id of photo
     :type id: int
     :param user_id: id of user who uploaded photo
@@ -88,6 +95,7 @@ class PhotoOut(PhotoIn):
     :type rating: float | None
     """
 
+    description: str
     id: int
     user_id: int
     photo_url: str
@@ -126,7 +134,7 @@ class TransformIn(BaseModel):
         height (int): The height of the transformed image (must be greater than 0, 0 means do not change).
         crop (str): The crop effects like:
             fill, lfill, fill_pad, crop, thumb, auto, scale, fit, limit, mfit, pad, lpad, mpad, imagga_scale, imagga_crop
-        effects (list[str]): The cloudinary transformation effects like:
+        effects (tuple[str, ...]): The cloudinary transformation effects like:
             art:al_dente/athena/audrey/aurora/daguerre/eucalyptus/fes/frost/hairspray/hokusai/incognito/linen/peacock
                 /primavera/quartz/red_rock/refresh/sizzle/sonnet/ukulele/zorro,
             cartoonify, pixelate, saturation, blur, sepia, grayscale, vignette - you can add :value (e.g. 20)
@@ -142,7 +150,7 @@ class TransformIn(BaseModel):
     width: int = 0
     height: int = 0
     crop: str = ""
-    effects: list[str] = []
+    effects: tuple[str, ...] = ()
 
     @field_validator("width", "height")
     def validate_width_height(cls, value) -> int:
@@ -158,30 +166,22 @@ class TransformIn(BaseModel):
         return value
 
     @field_validator("effects")
-    def validate_effects(cls, effects) -> list[str]:
+    def validate_effects(cls, effects) -> tuple[str, ...]:
         """
         Validate effects of transformation parameters.
 
         :param effects: effects given by user
         :return: effects
         """
-        if effects and len(effects) > 0:
-            for effect in effects:
-                effect, *_ = effect.split(":")
-                if effect not in [
-                    "art",
-                    "cartoonify",
-                    "pixelate",
-                    "saturation",
-                    "blur",
-                    "sepia",
-                    "grayscale",
-                    "vignette",
-                ]:
-                    raise ValueError(
-                        "The value of the effect has to be one of the following: art, cartoonify, pixelate,"
-                        "saturation, blur, sepia, grayscale, vignette"
-                    )
+        if effects:
+            names = {effect.partition(":")[0] for effect in effects}
+            invalid = names - TRANSFORM_EFFECTS
+            if invalid:
+                raise ValueError(
+                    f"Invalid effect(s): {', '.join(sorted(invalid))}. "
+                    f"The value of the effect has to be one of the following: "
+                    f"{', '.join(sorted(TRANSFORM_EFFECTS))}"
+                )
         return effects
 
 
@@ -208,7 +208,7 @@ class RatingOut(RatingIn):
     photo_id: int
     user_id: int
 
-    model_config = {"from_attributes": True}
+    model_config = ConfigDict(from_attributes=True)
 
 
 class RatingInfo(BaseModel):
@@ -222,3 +222,79 @@ class RatingInfo(BaseModel):
 
     rating: RatingOut
     detail: str
+
+
+class PhotoCursor(BaseModel):
+    """
+    Keyset pagination cursor pointing at the last photo of the returned page.
+
+    :param value: sort key of the last photo - upload date or rating, None if photos are not sorted
+    :type value: datetime | float | None
+    :param id: id of the last photo
+    :type id: int
+    :param sort_by: sort type the cursor was issued for, None if photos are not sorted
+    :type sort_by: PhotoSortType | None
+    """
+
+    value: datetime | float | None = None
+    id: int
+    sort_by: PhotoSortType | None = None
+
+    @classmethod
+    def from_photo(cls, photo, sort_by: str | None) -> "PhotoCursor":
+        """
+        Creates cursor pointing at provided photo for given sort type.
+
+        :param photo: last photo of the page
+        :type photo: Photo
+        :param sort_by: sort type used to get the page
+        :type sort_by: str | None
+        :return: cursor
+        :rtype: PhotoCursor
+        """
+        field = sort_by.split("-")[0] if sort_by else None
+        if field == "upload_date":
+            return cls(value=photo.uploaded_at, id=photo.id, sort_by=sort_by)
+        if field == "rating":
+            return cls(value=photo.average_rating or 0.0, id=photo.id, sort_by=sort_by)
+        return cls(id=photo.id)
+
+    def matches(self, sort_by: str | None) -> bool:
+        """
+        Checks if cursor can be used to get the next page for given sort type.
+
+        :param sort_by: requested sort type
+        :type sort_by: str | None
+        :return: True if cursor was issued for the same sort type and holds a matching sort key
+        :rtype: bool
+        """
+        if self.sort_by != sort_by:
+            return False
+        field = sort_by.split("-")[0] if sort_by else None
+        if field == "upload_date":
+            return isinstance(self.value, datetime)
+        if field == "rating":
+            return isinstance(self.value, float)
+        return True
+
+    def encode(self) -> str:
+        """
+        Encodes cursor as url safe string.
+
+        :return: encoded cursor
+        :rtype: str
+        """
+        return base64.urlsafe_b64encode(self.model_dump_json().encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "PhotoCursor":
+        """
+        Decodes cursor from url safe string.
+
+        :param cursor: encoded cursor
+        :type cursor: str
+        :return: cursor
+        :rtype: PhotoCursor
+        :raise: ValueError if cursor is malformed
+        """
+        return cls.model_validate_json(base64.urlsafe_b64decode(cursor.encode()))
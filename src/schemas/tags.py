@@ -4,6 +4,8 @@ from pydantic import BaseModel, Field, field_validator, ConfigDict
 
 from src.conf.constants import MAX_TAG_NAME_LENGTH
 
+TAG_INVALID_CHARACTERS = re.compile(r"[*^()<>?/|}{~:]")
+
 
 class TagIn(BaseModel):
     """
@@ -28,21 +30,24 @@ class TagIn(BaseModel):
             raise ValueError(
                 f"Tag name must be less than {MAX_TAG_NAME_LENGTH} characters"
             )
-        regex = re.compile(r"[*^()<>?/|}{~:]")
-        if regex.search(name):
+        if TAG_INVALID_CHARACTERS.search(name):
             raise ValueError(f"Tag name contains invalid characters")
         return name
 
 
-class TagOut(TagIn):
+class TagOut(BaseModel):
     """
-    Tag model for returning tag from database. Inherits from TagIn.
+    Tag model for returning tag from database.
+    Does not inherit from TagIn, so input validators are not run on data read from database.
 
     :param id: id of tag
     :type id: int
+    :param name: name of tag
+    :type name: str
     """
 
     id: int
+    name: str
 
     model_config = ConfigDict(from_attributes=True)
 
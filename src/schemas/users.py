@@ -1,6 +1,6 @@
 import re
 from datetime import datetime
-from enum import Enum
+from typing import Literal
 
 from pydantic import BaseModel, Field, EmailStr, field_validator, ConfigDict
 
@@ -18,24 +18,13 @@ from src.conf.constants import (
     INVALID_PASSWORD_MESSAGE,
 )
 
+PASSWORD_REGEX = re.compile(PASSWORD_PATTERN)
 
-class UserRoleEnum(str, Enum):
-    """
-    Enum for user roles.
-    """
-
-    admin = ROLE_ADMIN
-    moderator = ROLE_MODERATOR
-    standard = ROLE_STANDARD
-
-
-class UserRoleInEnum(str, Enum):
-    """
-    Enum for user roles when creating new user or changing role remotely.
-    """
 
-    moderator = ROLE_MODERATOR
-    standard = ROLE_STANDARD
+# user roles (validated by pydantic-core as plain strings)
+UserRoleType = Literal[ROLE_ADMIN, ROLE_MODERATOR, ROLE_STANDARD]
+# user roles when creating new user or changing role remotely
+UserRoleInType = Literal[ROLE_MODERATOR, ROLE_STANDARD]
 
 
 class UserRoleIn(BaseModel):
@@ -43,10 +32,10 @@ class UserRoleIn(BaseModel):
     Model for changing user role remotely.
 
     :param role: role of user
-    :type role: UserRoleInEnum
+    :type role: UserRoleInType
     """
 
-    role: UserRoleInEnum
+    role: UserRoleInType
 
 
 class UserIn(BaseModel):
@@ -82,11 +71,39 @@ class UserIn(BaseModel):
             raise ValueError(TOO_SHORT_PASSWORD_MESSAGE)
         elif len(password) > MAX_PASSWORD_LENGTH:
             raise ValueError(TOO_LONG_PASSWORD_MESSAGE)
-        elif not re.match(PASSWORD_PATTERN, password):
+        elif not PASSWORD_REGEX.match(password):
             raise ValueError(INVALID_PASSWORD_MESSAGE)
         return password
 
 
+class UserUpdate(UserIn):
+    """
+    Model for updating user. Password is optional - when it is omitted, the current one is kept.
+
+    :param username: username of user
+    :type username: str
+    :param email: email of user
+    :type email: EmailStr
+    :param password: new password of user or None to keep the current one
+    :type password: str | None
+    """
+
+    password: str | None = Field(min_length=8, max_length=45, default=None)
+
+    @field_validator("password")
+    def validate_password(cls, password: str | None) -> str | None:
+        """
+        Validate password if it is provided.
+
+        :param password: password to validate
+        :return: password or None
+        :raise: ValueError if password is not valid
+        """
+        if password is None:
+            return None
+        return UserIn.validate_password(password)
+
+
 class UserDb(BaseModel):
     """
     Model for returning user from database.
@@ -98,7 +115,7 @@ class UserDb(BaseModel):
     :param email: email of user
     :type email: EmailStr
     :param role: role of user
-    :type role: UserRoleEnum
+    :type role: UserRoleType
     :param created_at: date and time when user was created
     :type created_at: datetime
     :param avatar: url of user avatar
@@ -110,7 +127,7 @@ class UserDb(BaseModel):
     id: int
     username: str
     email: EmailStr
-    role: UserRoleEnum
+    role: UserRoleType
     created_at: datetime
     avatar: str
     is_active: bool
@@ -31,7 +31,7 @@ class AbstractPasswordHandler(abc.ABC):
     """
 
     @abc.abstractmethod
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
         Verifies password hash against plain password
 
@@ -45,7 +45,7 @@ class AbstractPasswordHandler(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def get_password_hash(self, password: str) -> str:
+    async def get_password_hash(self, password: str) -> str:
         """
         Returns hashed password
 
@@ -56,6 +56,18 @@ class AbstractPasswordHandler(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Checks if password hash was created with outdated algorithm or parameters
+
+        :param hashed_password: hashed password to check
+        :type hashed_password: str
+        :return: True if password should be hashed again, False otherwise
+        :rtype: bool
+        """
+        pass
+
 
 class AbstractPhotoStorageProvider(abc.ABC):
     """
@@ -133,11 +145,55 @@ class AbstractQrCodeProvider(abc.ABC):
     @abc.abstractmethod
     async def stream_qr_code(self, url: str):
         """
-        Streams QR code image for provided url
+        Returns QR code image for provided url
 
         :param url: photo url to create QR code for
         :type url: str
-        :return: StreamingResponse object with QR code image
-        :rtype: StreamingResponse
+        :return: Response object with QR code image
+        :rtype: Response
+        """
+        pass
+
+
+class AbstractCache(abc.ABC):
+    """
+    Abstract class for cache of serialized responses
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """
+        Gets cached value
+
+        :param key: key of cached value
+        :type key: str
+        :return: cached value or None if key is not cached
+        :rtype: bytes | None
+        """
+        pass
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: str | bytes, expire: int) -> None:
+        """
+        Caches value
+
+        :param key: key to cache value under
+        :type key: str
+        :param value: value to cache
+        :type value: str | bytes
+        :param expire: seconds after which value expires
+        :type expire: int
+        :return: None
+        """
+        pass
+
+    @abc.abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """
+        Removes values from cache
+
+        :param keys: keys of values to remove
+        :type keys: str
+        :return: None
         """
         pass
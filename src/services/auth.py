@@ -1,10 +1,14 @@
-import pickle
+import asyncio
+import hashlib
+import time
 import uuid
 from datetime import datetime, timedelta
 
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends
 import jwt
+from cachetools import TTLCache
+from pydantic import ValidationError
 
 from src.conf.config import settings
 from src.conf.errors import UnauthorizedError, ForbiddenError
@@ -12,6 +16,7 @@ from src.conf.constants import (
     AUTH,
     API,
     REDIS_EXPIRE,
+    UNKNOWN_EMAIL_EXPIRE,
     INVALID_SCOPE,
     COULD_NOT_VALIDATE_CREDENTIALS,
     LOG_IN_AGAIN,
@@ -20,8 +25,11 @@ from src.conf.constants import (
     ACCESS_TOKEN_EXPIRE,
     REFRESH_TOKEN_EXPIRE,
     BANNED_USER,
+    ACCESS_TOKEN_CACHE_SIZE,
+    ACCESS_TOKEN_CACHE_TTL,
 )
 from src.database.models import User
+from src.schemas.users import UserDb
 from src.repository.abstract import AbstractUserRepo
 from src.database.dependencies import get_user_repository, get_redis
 
@@ -38,6 +46,8 @@ class Auth:
     :type oauth2_scheme: OAuth2PasswordBearer
     :param redis_connection: Redis client
     :type redis_connection: Redis
+    :param access_token_cache: cache of verified access token payloads, keyed by token digest
+    :type access_token_cache: TTLCache
     """
 
     SECRET_KEY = settings.secret_key
@@ -52,23 +62,86 @@ class Auth:
         :type redis_connection: Redis
         """
         self.redis_connection = redis_connection
+        self.access_token_cache = TTLCache(
+            maxsize=ACCESS_TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_CACHE_TTL
+        )
+
+    def decode_access_token(self, token: str) -> dict:
+        """
+        This method is used to decode access token.
+        Verified payloads are cached for a short time, so token presented again
+        is served from the cache without signature verification. Expiry is still checked on every call.
+
+        :param token: token to decode
+        :type token: str
+        :return: payload decoded from token
+        :rtype: dict
+        :raise: jwt.exceptions.PyJWTError if token is invalid or expired
+        """
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        payload = self.access_token_cache.get(key)
+        if payload is None:
+            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            self.access_token_cache[key] = payload
+        elif payload["exp"] <= time.time():
+            del self.access_token_cache[key]
+            raise jwt.exceptions.ExpiredSignatureError("Signature has expired")
+        return payload
 
     async def update_user_in_redis(
         self,
         email: str,
-        user: User,
+        user: User | UserDb,
     ):
         """
-        This method is used to update user in Redis.
+        This method is used to update user in Redis. User is stored as serialized UserDb JSON,
+        value and expiration are set with a single SET ... EX command.
 
         :param email: email of user to update
         :type email: str
         :param user: user to update
-        :type user: User
+        :type user: User | UserDb
+        :return: None
+        """
+        await self.redis_connection.set(
+            f"user:{email}",
+            UserDb.model_validate(user).model_dump_json(),
+            ex=REDIS_EXPIRE,
+        )
+
+    async def is_unknown_email(self, email: str) -> bool:
+        """
+        This method is used to check if email was recently looked up in database and not found.
+
+        :param email: email to check
+        :type email: str
+        :return: True if email is cached as not registered, False otherwise
+        :rtype: bool
+        """
+        return await self.redis_connection.get(f"unknown_email:{email}") is not None
+
+    async def set_unknown_email(self, email: str) -> None:
+        """
+        This method is used to cache for a short time that email is not registered,
+        so repeated logins with it do not hit the database.
+
+        :param email: email not found in database
+        :type email: str
+        :return: None
+        """
+        await self.redis_connection.set(
+            f"unknown_email:{email}", "", ex=UNKNOWN_EMAIL_EXPIRE
+        )
+
+    async def delete_unknown_email(self, email: str) -> None:
+        """
+        This method is used to remove email from the not registered cache, e.g. after signup.
+
+        :param email: email to remove
+        :type email: str
         :return: None
         """
-        await self.redis_connection.set(f"user:{email}", pickle.dumps(user))
-        await self.redis_connection.expire(f"user:{email}", REDIS_EXPIRE)
+        await self.redis_connection.delete(f"unknown_email:{email}")
 
     async def create_access_token(
         self,
@@ -93,6 +166,7 @@ class Auth:
                 "iat": datetime.utcnow(),
                 "exp": expire,
                 "session_id": session_id,
+                "jti": str(uuid.uuid4()),
                 "scope": ACCESS_TOKEN,
             }
         )
@@ -119,21 +193,26 @@ class Auth:
         to_encode = data.copy()
         expire = datetime.utcnow() + expires_delta
         to_encode.update(
-            {"iat": datetime.utcnow(), "exp": expire, "scope": REFRESH_TOKEN}
+            {
+                "iat": datetime.utcnow(),
+                "exp": expire,
+                "jti": str(uuid.uuid4()),
+                "scope": REFRESH_TOKEN,
+            }
         )
         encode_refresh_token = jwt.encode(
             to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM
         )
         return encode_refresh_token, expire
 
-    async def decode_refresh_token(self, refresh_token: str) -> str:
+    async def decode_refresh_token(self, refresh_token: str) -> dict:
         """
         This method is used to decode refresh token.
 
         :param refresh_token: refresh token to decode
         :type refresh_token: str
-        :return: email decoded from refresh token
-        :rtype: str
+        :return: payload decoded from refresh token (sub, session_id, jti, exp)
+        :rtype: dict
         :raise: UnauthorizedError if token has invalid scope or if token is invalid
         """
         try:
@@ -141,58 +220,101 @@ class Auth:
                 refresh_token, self.SECRET_KEY, algorithms=[self.ALGORITHM]
             )
             if payload["scope"] == REFRESH_TOKEN:
-                email = payload["sub"]
-                return email
+                if payload.get("jti") is None or payload.get("session_id") is None:
+                    raise UnauthorizedError(detail=COULD_NOT_VALIDATE_CREDENTIALS)
+                return payload
             raise UnauthorizedError(detail=INVALID_SCOPE)
         except jwt.exceptions.PyJWTError:
             raise UnauthorizedError(detail=COULD_NOT_VALIDATE_CREDENTIALS)
 
+    async def blacklist_token(self, token_id: str, expire: int) -> bool:
+        """
+        This method is used to put token id (jti or session id) on the blacklist in Redis.
+        The entry expires together with the token, so the blacklist never needs cleaning.
+
+        :param token_id: jti or session id to blacklist
+        :type token_id: str
+        :param expire: seconds until the blacklisted token expires
+        :type expire: int
+        :return: True if token id was blacklisted now, False if it was already on the blacklist
+        :rtype: bool
+        """
+        return bool(
+            await self.redis_connection.set(
+                f"blacklist:{token_id}", "", ex=max(expire, 1), nx=True
+            )
+        )
+
+    async def is_token_blacklisted(self, token_id: str) -> bool:
+        """
+        This method is used to check if token id (jti or session id) is on the blacklist in Redis.
+
+        :param token_id: jti or session id to check
+        :type token_id: str
+        :return: True if token id is blacklisted, False otherwise
+        :rtype: bool
+        """
+        return await self.redis_connection.get(f"blacklist:{token_id}") is not None
+
     async def get_current_user(
         self,
         token: str = Depends(oauth2_scheme),
         user_repo: AbstractUserRepo = Depends(get_user_repository),
-    ) -> User:
+    ) -> UserDb:
         """
         This method is used to get current authenticated user.
+        User data is served from Redis cache and loaded from database only on cache miss.
         :param token: token to decode
         :type token: str
         :param user_repo: repository to get user from
         :type user_repo: AbstractUserRepo
         :return: user decoded from token
-        :rtype: User
+        :rtype: UserDb
         :raises:
             UnauthorizedError if token is invalid or user is logged out
             ForbiddenError if user is banned
         """
         try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = self.decode_access_token(token)
             if payload["scope"] == ACCESS_TOKEN:
                 email: str = payload["sub"]
-                if email is None:
+                session_id: str = payload.get("session_id")
+                if email is None or session_id is None:
                     raise UnauthorizedError(detail=COULD_NOT_VALIDATE_CREDENTIALS)
             else:
                 raise UnauthorizedError(detail=COULD_NOT_VALIDATE_CREDENTIALS)
         except jwt.exceptions.PyJWTError:
             raise UnauthorizedError(detail=COULD_NOT_VALIDATE_CREDENTIALS)
-        user = await self.redis_connection.get(f"user:{email}")
+        # blacklist check and cached user lookup are independent, so both Redis requests are sent at once
+        blacklisted, cached_user = await asyncio.gather(
+            self.is_token_blacklisted(session_id),
+            self.redis_connection.get(f"user:{email}"),
+        )
+        if blacklisted:
+            raise UnauthorizedError(detail=LOG_IN_AGAIN)
+        user = None
+        if cached_user is not None:
+            try:
+                user = UserDb.model_validate_json(cached_user)
+            except ValidationError:
+                # entry written in an outdated format - reload it from database
+                user = None
         if user is None:
-            user = await user_repo.get_user_by_email(email)
-            if user is None:
+            db_user = await user_repo.get_user_by_email(email)
+            if db_user is None:
                 raise UnauthorizedError(
                     detail=f"{COULD_NOT_VALIDATE_CREDENTIALS}, email: {email}"
                 )
+            user = UserDb.model_validate(db_user)
             await self.update_user_in_redis(email, user)
-        else:
-            user = pickle.loads(user)
-        if await user_repo.is_user_logout(token):
-            raise UnauthorizedError(detail=LOG_IN_AGAIN)
         if not user.is_active:
             raise ForbiddenError(detail=BANNED_USER)
         return user
 
     async def get_session_id_from_token(self, token: str, user_email: str) -> str:
         """
-        This method is used to get session id from token.
+        This method is used to get session id from token. Token is decoded with decode_access_token,
+        so token already verified in this request is served from the cache.
 
         :param token: token to decode
         :type token: str
@@ -203,7 +325,7 @@ class Auth:
         :raise: UnauthorizedError if token has invalid scope or if token is invalid
         """
         try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = self.decode_access_token(token)
             if payload["scope"] == ACCESS_TOKEN:
                 email: str = payload["sub"]
                 session_id = payload["session_id"]
@@ -1,18 +1,16 @@
-from libgravatar import Gravatar
+import hashlib
 
 from src.services.abstract import AbstractAvatarProvider
-from src.conf.logger import logger
+from src.conf.constants import DEFAULT_AVATAR_URL_START_V1_GRAVATAR
 
 
 class AvatarProviderGravatar(AbstractAvatarProvider):
     """
     This class is an implementation of the AbstractAvatarProvider interface to use with the Gravatar service.
+    Gravatar url is a pure function of the email hash, so it is built locally without any request.
     """
 
-    def __init__(self):
-        self.gravatar = None
-
-    def get_avatar(self, email: str, size: int) -> str | None:
+    def get_avatar(self, email: str, size: int) -> str:
         """
         Returns url to avatar image for provided email and size
 
@@ -23,9 +21,5 @@ class AvatarProviderGravatar(AbstractAvatarProvider):
         :return: url to avatar image
         :rtype: str
         """
-        try:
-            self.gravatar = Gravatar(email)
-            return self.gravatar.get_image(size=size)
-        except Exception as e:
-            logger.error(e)
-            return None
+        email_hash = hashlib.md5(email.strip().lower().encode("utf-8")).hexdigest()
+        return f"{DEFAULT_AVATAR_URL_START_V1_GRAVATAR}{email_hash}?s={size}"
@@ -0,0 +1,66 @@
+from redis.asyncio import Redis
+
+from src.services.abstract import AbstractCache
+
+
+class RedisCache(AbstractCache):
+    """
+    This class is an implementation of the AbstractCache interface to use with Redis.
+    """
+
+    def __init__(self, redis_connection: Redis):
+        """
+        Constructor.
+
+        :param redis_connection: Redis client
+        :type redis_connection: Redis
+        """
+        self.redis_connection = redis_connection
+
+    async def get(self, key: str) -> bytes | None:
+        """
+        Gets cached value
+
+        :param key: key of cached value
+        :type key: str
+        :return: cached value or None if key is not cached
+        :rtype: bytes | None
+        """
+        return await self.redis_connection.get(key)
+
+    async def set(self, key: str, value: str | bytes, expire: int) -> None:
+        """
+        Caches value
+
+        :param key: key to cache value under
+        :type key: str
+        :param value: value to cache
+        :type value: str | bytes
+        :param expire: seconds after which value expires
+        :type expire: int
+        :return: None
+        """
+        await self.redis_connection.set(key, value, ex=expire)
+
+    async def delete(self, *keys: str) -> None:
+        """
+        Removes values from cache
+
+        :param keys: keys of values to remove
+        :type keys: str
+        :return: None
+        """
+        if keys:
+            await self.redis_connection.delete(*keys)
+
+
+def photo_cache_key(photo_id: int) -> str:
+    """
+    Returns cache key of serialized photo.
+
+    :param photo_id: id of photo
+    :type photo_id: int
+    :return: cache key
+    :rtype: str
+    """
+    return f"photo:{photo_id}"
@@ -1,6 +1,125 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Any
+
 import bcrypt
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import VerificationError, InvalidHashError
 
 from src.services.abstract import AbstractPasswordHandler
+from src.conf.constants import (
+    ARGON2_TIME_COST,
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM,
+    ARGON2_HASH_LEN,
+    ARGON2_SALT_LEN,
+)
+
+password_hasher = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST,
+    parallelism=ARGON2_PARALLELISM,
+    hash_len=ARGON2_HASH_LEN,
+    salt_len=ARGON2_SALT_LEN,
+    type=Type.ID,
+)
+
+password_executor: ProcessPoolExecutor | None = None
+
+
+def start_password_executor(max_workers: int | None = None) -> None:
+    """
+    Starts the process pool used for password hashing and verification.
+
+    :param max_workers: number of worker processes, defaults to the number of CPUs
+    :type max_workers: int | None
+    :return: None
+    """
+    global password_executor
+    password_executor = ProcessPoolExecutor(max_workers=max_workers)
+
+
+def shutdown_password_executor() -> None:
+    """
+    Shuts down the process pool used for password hashing and verification.
+
+    :return: None
+    """
+    global password_executor
+    if password_executor is not None:
+        password_executor.shutdown(cancel_futures=True)
+        password_executor = None
+
+
+async def run_in_password_executor(func: Callable[..., Any], *args) -> Any:
+    """
+    Runs CPU-bound password function outside the event loop.
+    Uses the process pool if it was started, the default thread pool otherwise.
+
+    :param func: top-level (picklable) function to run
+    :type func: Callable
+    :param args: arguments of the function
+    :return: result of the function
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, func, *args)
+
+
+def bcrypt_hash(password: str) -> str:
+    """
+    Hashes password with bcrypt.
+
+    :param password: password to hash
+    :type password: str
+    :return: bcrypt hash of password
+    :rtype: str
+    """
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+def bcrypt_verify(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies plain password against bcrypt hash.
+
+    :param plain_password: plain password to verify
+    :type plain_password: str
+    :param hashed_password: bcrypt hash to verify against
+    :type hashed_password: str
+    :return: True if password is valid, False otherwise
+    :rtype: bool
+    """
+    return bcrypt.checkpw(
+        plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+    )
+
+
+def argon2_hash(password: str) -> str:
+    """
+    Hashes password with Argon2id.
+
+    :param password: password to hash
+    :type password: str
+    :return: argon2 hash of password
+    :rtype: str
+    """
+    return password_hasher.hash(password)
+
+
+def argon2_verify(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies plain password against argon2 hash.
+
+    :param plain_password: plain password to verify
+    :type plain_password: str
+    :param hashed_password: argon2 hash to verify against
+    :type hashed_password: str
+    :return: True if password is valid, False if it does not match or hash is invalid
+    :rtype: bool
+    """
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
 
 
 class BcryptPasswordHandler(AbstractPasswordHandler):
@@ -8,7 +127,7 @@ class BcryptPasswordHandler(AbstractPasswordHandler):
     This class is an implementation of the AbstractPasswordHandler interface to use with the bcrypt library.
     """
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
         Verifies password hash against plain password
         :param plain_password: plain password to verify
@@ -18,11 +137,11 @@ class BcryptPasswordHandler(AbstractPasswordHandler):
         :return: True if password is valid, False otherwise
         :rtype: bool
         """
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        return await run_in_password_executor(
+            bcrypt_verify, plain_password, hashed_password
         )
 
-    def get_password_hash(self, password: str) -> str:
+    async def get_password_hash(self, password: str) -> str:
         """
         Returns hashed password
 
@@ -31,4 +150,69 @@ class BcryptPasswordHandler(AbstractPasswordHandler):
         :return: hashed password
         :rtype: str
         """
-        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        return await run_in_password_executor(bcrypt_hash, password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Checks if password hash was created with outdated algorithm or parameters
+
+        :param hashed_password: hashed password to check
+        :type hashed_password: str
+        :return: always False, bcrypt hashes are not migrated by this handler
+        :rtype: bool
+        """
+        return False
+
+
+class Argon2PasswordHandler(AbstractPasswordHandler):
+    """
+    This class is an implementation of the AbstractPasswordHandler interface to use with the argon2-cffi library.
+    Hashes passwords with Argon2id and still verifies legacy bcrypt hashes, so they can be rehashed on login.
+    """
+
+    @staticmethod
+    def __is_bcrypt_hash(hashed_password: str) -> bool:
+        return hashed_password.startswith("$2")
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verifies password hash against plain password
+
+        :param plain_password: plain password to verify
+        :type plain_password: str
+        :param hashed_password: hashed password (argon2 or legacy bcrypt) to verify against
+        :type hashed_password: str
+        :return: True if password is valid, False otherwise
+        :rtype: bool
+        """
+        if self.__is_bcrypt_hash(hashed_password):
+            return await run_in_password_executor(
+                bcrypt_verify, plain_password, hashed_password
+            )
+        return await run_in_password_executor(
+            argon2_verify, plain_password, hashed_password
+        )
+
+    async def get_password_hash(self, password: str) -> str:
+        """
+        Returns hashed password
+
+        :param password: password to hash
+        :type password: str
+        :return: hashed password
+        :rtype: str
+        """
+        return await run_in_password_executor(argon2_hash, password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Checks if password hash was created with outdated algorithm or parameters
+
+        :param hashed_password: hashed password to check
+        :type hashed_password: str
+        :return: True if hash is a legacy bcrypt hash or uses outdated argon2 parameters, False otherwise
+        :rtype: bool
+        """
+        if self.__is_bcrypt_hash(hashed_password):
+            return True
+        return password_hasher.check_needs_rehash(hashed_password)
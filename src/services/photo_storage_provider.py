@@ -1,3 +1,5 @@
+import asyncio
+
 import cloudinary
 import cloudinary.uploader
 from fastapi import File
@@ -10,6 +12,7 @@ from src.conf.constants import (
     CLOUDINARY_AVATAR_PUBLIC_ID_PREFIX,
     AVATAR_WIDTH,
     AVATAR_HEIGHT,
+    PHOTO_UPLOAD_CHUNK_SIZE,
 )
 from src.conf.logger import logger
 from src.conf.errors import PhotoStorageProviderError, NotFoundError
@@ -35,6 +38,9 @@ class CloudinaryPhotoStorageProvider(AbstractPhotoStorageProvider):
     async def _upload(self, file, prefix: str) -> str:
         """
         Helper method to upload file (photo or avatar) to Cloudinary.
+        Cloudinary client is blocking, so the upload runs in a worker thread and does not stall the event loop.
+        File is read and sent in PHOTO_UPLOAD_CHUNK_SIZE chunks, so large photos are not buffered in memory at once.
+        upload_large defaults to a raw asset, so resource_type is set to image explicitly.
 
         :param file: file to upload
         :type file: File
@@ -46,8 +52,11 @@ class CloudinaryPhotoStorageProvider(AbstractPhotoStorageProvider):
         """
         public_id_prefix = prefix
         try:
-            upload_result = self.cloudinary.uploader.upload(
+            upload_result = await asyncio.to_thread(
+                self.cloudinary.uploader.upload_large,
                 file,
+                chunk_size=PHOTO_UPLOAD_CHUNK_SIZE,
+                resource_type="image",
                 public_id_prefix=public_id_prefix,
                 overwrite=True,
             )
@@ -70,7 +79,7 @@ class CloudinaryPhotoStorageProvider(AbstractPhotoStorageProvider):
 
     async def _delete(self, prefix: str, file_url: str):
         """
-        Helper method to delete file from Cloudinary.
+        Helper method to delete file from Cloudinary. Runs the blocking Cloudinary call in a worker thread.
 
         :param prefix: cloudinary public id prefix to use
         :type prefix: str
@@ -81,7 +90,9 @@ class CloudinaryPhotoStorageProvider(AbstractPhotoStorageProvider):
         """
         try:
             file_public_id = f"{prefix}/{file_url.split('/')[-1].split('.')[0]}"
-            self.cloudinary.uploader.destroy(file_public_id, invalidate=True)
+            await asyncio.to_thread(
+                self.cloudinary.uploader.destroy, file_public_id, invalidate=True
+            )
         except Exception as e:
             logger.error(e)
             raise PhotoStorageProviderError(detail="Photo storage provider error")
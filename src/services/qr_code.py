@@ -1,9 +1,29 @@
+import asyncio
 import io
+from functools import lru_cache
 
 import qrcode
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 
 from src.services.abstract import AbstractQrCodeProvider
+from src.conf.constants import QR_CODE_CACHE_SIZE
+
+
+@lru_cache(maxsize=QR_CODE_CACHE_SIZE)
+def make_qr_code_png(url: str) -> bytes:
+    """
+    Renders QR code for provided url as PNG bytes.
+    Result is cached, as QR code is deterministic for given url.
+
+    :param url: url to create QR code for
+    :type url: str
+    :return: PNG image bytes
+    :rtype: bytes
+    """
+    qr_code_img = qrcode.make(url)
+    buffer = io.BytesIO()
+    qr_code_img.save(buffer, format="PNG")
+    return buffer.getvalue()
 
 
 class QrCodeProvider(AbstractQrCodeProvider):
@@ -12,15 +32,13 @@ class QrCodeProvider(AbstractQrCodeProvider):
     """
     async def stream_qr_code(self, url: str):
         """
-        Streams QR code image for provided url
+        Returns QR code image for provided url.
+        PNG is only a few KiB and is already in memory, so it is sent as a single body with Content-Length.
 
         :param url: url to create QR code for
         :type url: str
-        :return: StreamingResponse object with QR code image
-        :rtype: StreamingResponse
+        :return: Response object with QR code image
+        :rtype: Response
         """
-        qr_code_img = qrcode.make(url)
-        buffer = io.BytesIO()
-        qr_code_img.save(buffer, format="PNG")
-        buffer.seek(0)
-        return StreamingResponse(buffer, media_type="image/png")
+        qr_code_png = await asyncio.to_thread(make_qr_code_png, url)
+        return Response(content=qr_code_png, media_type="image/png")
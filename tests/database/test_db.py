@@ -0,0 +1,40 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException, status
+
+from src.database.db import get_db
+from src.conf.errors import NotFoundError
+
+
+class TestGetDb(unittest.TestCase):
+    def setUp(self):
+        session_patcher = patch("src.database.db.SessionLocal")
+        logger_patcher = patch("src.database.db.logger")
+        self.session_local = session_patcher.start()
+        self.logger = logger_patcher.start()
+        self.addCleanup(session_patcher.stop)
+        self.addCleanup(logger_patcher.stop)
+        self.db = self.session_local.return_value
+
+    def test_client_errors_are_not_logged(self):
+        for error in (
+            NotFoundError(detail="not found"),
+            HTTPException(status_code=status.HTTP_404_NOT_FOUND),
+        ):
+            gen = get_db()
+            next(gen)
+            with self.assertRaises(type(error)):
+                gen.throw(error)
+        self.logger.exception.assert_not_called()
+        self.db.rollback.assert_not_called()
+        self.assertEqual(self.db.close.call_count, 2)
+
+    def test_unexpected_error_is_logged_and_rolled_back(self):
+        gen = get_db()
+        next(gen)
+        with self.assertRaises(RuntimeError):
+            gen.throw(RuntimeError("db error"))
+        self.logger.exception.assert_called_once()
+        self.db.rollback.assert_called_once()
+        self.db.close.assert_called_once()
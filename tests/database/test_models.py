@@ -1,5 +1,4 @@
 import unittest
-from datetime import datetime, timedelta
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.database.models import (
@@ -9,8 +8,6 @@ from src.database.models import (
     Tag,
     Comment,
     Rating,
-    RefreshToken,
-    LogoutAccessToken,
 )
 
 
@@ -101,56 +98,21 @@ class TestDatabaseModels(unittest.TestCase):
         self.assertEqual(retrieved_rating.photo_id, photo.id)
         self.assertEqual(retrieved_rating.user_id, user.id)
 
-    def test_refresh_token_model(self):
-        user = User(username="testuser", email="test@example.com", password="password")
-        self.session.add(user)
-        self.session.commit()
-
-        refresh_token = RefreshToken(
-            refresh_token="testtoken",
-            user_id=user.id,
-            session_id="testsession",
-            expires_at=datetime.utcnow() + timedelta(days=7),
-        )
-        self.session.add(refresh_token)
-        self.session.commit()
-
-        retrieved_token = (
-            self.session.query(RefreshToken)
-            .filter_by(refresh_token="testtoken")
-            .first()
-        )
-        self.assertIsNotNone(retrieved_token)
-        self.assertEqual(retrieved_token.user_id, user.id)
-        self.assertEqual(retrieved_token.session_id, "testsession")
-
-    def test_logout_access_token_model(self):
-        logout_token = LogoutAccessToken(
-            logout_access_token="testlogouttoken",
-            expires_at=datetime.utcnow() + timedelta(minutes=15),
-        )
-        self.session.add(logout_token)
-        self.session.commit()
-
-        retrieved_token = (
-            self.session.query(LogoutAccessToken)
-            .filter_by(logout_access_token="testlogouttoken")
-            .first()
-        )
-        self.assertIsNotNone(retrieved_token)
-        self.assertTrue(retrieved_token.expires_at > datetime.utcnow())
-
     def test_photo_average_rating(self):
         user = User(username="testuser", email="test@example.com", password="password")
-        self.session.add(user)
+        user_2 = User(
+            username="testuser2", email="test2@example.com", password="password"
+        )
+        self.session.add_all([user, user_2])
         self.session.commit()
         self.session.refresh(user)
+        self.session.refresh(user_2)
         photo = Photo(user_id=user.id, photo_url="http://example.com/photo.jpg")
         self.session.add(photo)
         self.session.commit()
 
         rating1 = Rating(photo_id=photo.id, user_id=user.id, score=4)
-        rating2 = Rating(photo_id=photo.id, user_id=user.id, score=5)
+        rating2 = Rating(photo_id=photo.id, user_id=user_2.id, score=5)
         self.session.add_all([rating1, rating2])
         self.session.commit()
 
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from src.conf.constants import (
     COMMENT_NOT_FOUND,
     FORBIDDEN_FOR_NOT_OWNER,
+    PHOTO_NOT_FOUND,
 )
 from src.conf.errors import NotFoundError, ForbiddenError
 from src.repository.comments import PostgresCommentRepo
@@ -38,12 +39,25 @@ class TestPostgresCommentRepo(unittest.IsolatedAsyncioTestCase):
         )
 
     async def test_create_comment_success(self):
+        self.db.scalar.return_value = self.comment
         comment = await self.repo.create_comment(
             self.comment_content, self.photo_id, self.user_id
         )
         self.assertEqual(self.comment.content, comment.content)
         self.assertEqual(self.comment.photo_id, comment.photo_id)
         self.assertEqual(self.comment.user_id, comment.user_id)
+        self.db.scalar.assert_called_once()
+        self.db.get.assert_not_called()
+        self.db.expunge.assert_called_once_with(self.comment)
+        self.db.commit.assert_called_once()
+
+    async def test_create_comment_no_photo(self):
+        self.db.scalar.return_value = None
+        with self.assertRaises(NotFoundError) as e:
+            await self.repo.create_comment(
+                self.comment_content, self.photo_id, self.user_id
+            )
+        self.assertEqual(e.exception.detail, PHOTO_NOT_FOUND)
 
     async def test_get_comments_success(self):
         self.db.query.return_value.filter.return_value.all.return_value = [
@@ -55,6 +69,19 @@ class TestPostgresCommentRepo(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(self.comment.content, comments[0].content)
         self.assertEqual(self.comment_2, comments[1])
 
+    async def test_get_comments_no_comments(self):
+        self.db.query.return_value.filter.return_value.all.return_value = []
+        self.db.query.return_value.scalar.return_value = True
+        comments = await self.repo.get_comments(self.photo_id)
+        self.assertEqual(comments, [])
+
+    async def test_get_comments_no_photo(self):
+        self.db.query.return_value.filter.return_value.all.return_value = []
+        self.db.query.return_value.scalar.return_value = False
+        with self.assertRaises(NotFoundError) as e:
+            await self.repo.get_comments(999)
+        self.assertEqual(e.exception.detail, PHOTO_NOT_FOUND)
+
     async def test_get_comment_by_id_success(self):
         self.db.query.return_value.filter.return_value.first.return_value = self.comment
         comment = await self.repo.get_comment_by_id(self.comment_id)
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 
 from src.conf.errors import NotFoundError, ForbiddenError
 from src.database.models import Tag, User, Photo, Rating
-from src.schemas.photos import PhotoIn, RatingIn
+from src.schemas.photos import PhotoIn, RatingIn, PhotoCursor
 from src.schemas.tags import TagIn
 from src.repository.photos import PostgresPhotoRepo
 from src.conf.constants import (
@@ -240,7 +240,7 @@ class TestPostgresPhotoRepo(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(e.exception.detail, FORBIDDEN_FOR_NOT_OWNER)
 
     async def test_get_photos_all_success(self):
-        self.db.query.return_value.offset.return_value.limit.return_value.all.return_value = [
+        self.db.query.return_value.options.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
             self.photo,
             self.photo_2,
         ]
@@ -252,7 +252,7 @@ class TestPostgresPhotoRepo(unittest.IsolatedAsyncioTestCase):
         assert photos_out[1].user_id == self.user_2.id
 
     async def test_get_photos_with_query_success(self):
-        self.db.query.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = [
+        self.db.query.return_value.options.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
             self.photo_2
         ]
         photos_out = await self.repo.get_photos(self.skip, self.limit, query="Another")
@@ -260,7 +260,7 @@ class TestPostgresPhotoRepo(unittest.IsolatedAsyncioTestCase):
         assert photos_out[0].id == self.photo_2.id
         assert photos_out[0].description == self.photo_2.description
 
-        self.db.query.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = [
+        self.db.query.return_value.options.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
             self.photo,
             self.photo_2,
         ]
@@ -268,7 +268,7 @@ class TestPostgresPhotoRepo(unittest.IsolatedAsyncioTestCase):
         assert len(photos_out) == 2
 
     async def test_get_photos_with_user_id_success(self):
-        self.db.query.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = [
+        self.db.query.return_value.options.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
             self.photo_2
         ]
         photos_out = await self.repo.get_photos(
@@ -279,7 +279,7 @@ class TestPostgresPhotoRepo(unittest.IsolatedAsyncioTestCase):
         assert photos_out[0].user_id == self.user_2.id
 
     async def test_get_photos_with_user_id_and_query_success(self):
-        self.db.query.return_value.filter.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = [
+        self.db.query.return_value.options.return_value.filter.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
             self.photo_2
         ]
         photos_out = await self.repo.get_photos(
@@ -303,7 +303,7 @@ class TestPostgresPhotoRepo(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(e.exception.detail, USER_NOT_FOUND)
 
     async def test_get_photos_with_sort_by_success(self):
-        self.db.query.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
+        self.db.query.return_value.options.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
             self.photo_2,
             self.photo,
         ]
@@ -314,7 +314,7 @@ class TestPostgresPhotoRepo(unittest.IsolatedAsyncioTestCase):
         assert photos_out[0].id == self.photo_2.id
         assert photos_out[1].id == self.photo.id
 
-        self.db.query.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
+        self.db.query.return_value.options.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
             self.photo,
             self.photo_2,
         ]
@@ -325,7 +325,7 @@ class TestPostgresPhotoRepo(unittest.IsolatedAsyncioTestCase):
         assert photos_out[0].id == self.photo.id
         assert photos_out[1].id == self.photo_2.id
 
-        self.db.query.return_value.outerjoin.return_value.group_by.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
+        self.db.query.return_value.options.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
             self.photo_2,
             self.photo,
         ]
@@ -337,7 +337,7 @@ class TestPostgresPhotoRepo(unittest.IsolatedAsyncioTestCase):
         assert photos_out[0].id == self.photo_2.id
         assert photos_out[1].id == self.photo.id
 
-        self.db.query.return_value.outerjoin.return_value.group_by.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
+        self.db.query.return_value.options.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
             self.photo,
             self.photo_2,
         ]
@@ -349,24 +349,44 @@ class TestPostgresPhotoRepo(unittest.IsolatedAsyncioTestCase):
         assert photos_out[0].id == self.photo.id
         assert photos_out[1].id == self.photo_2.id
 
+    async def test_get_photos_with_cursor_success(self):
+        self.db.query.return_value.options.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+            self.photo_2
+        ]
+        photos_out = await self.repo.get_photos(
+            5, self.limit, cursor=PhotoCursor(id=self.photo.id)
+        )
+        assert len(photos_out) == 1
+        assert photos_out[0].id == self.photo_2.id
+        self.db.query.return_value.options.return_value.filter.return_value.order_by.return_value.offset.assert_not_called()
+
+        photos_out = await self.repo.get_photos(
+            0,
+            self.limit,
+            sort_by="upload_date-desc",
+            cursor=PhotoCursor(value=self.photo.uploaded_at, id=self.photo.id),
+        )
+        assert len(photos_out) == 1
+        assert photos_out[0].id == self.photo_2.id
+
     async def test_add_transform_photo_success(self):
         transform_params = ["param1", "param2"]
         transformation_url = "http://example.com/transformation"
-        self.repo.get_photo_by_id = AsyncMock(return_value=self.photo)
         photo_with_transform = await self.repo.add_transform_photo(
-            self.photo.id,
+            self.photo,
             transform_params,
             transformation_url,
         )
-        self.repo.get_photo_by_id.assert_called_once_with(self.photo.id)
+        self.db.query.assert_not_called()
         self.assertEqual(len(photo_with_transform.transformations), 1)
         self.assertEqual(photo_with_transform.transformations[1][0], transformation_url)
         self.assertEqual(photo_with_transform.transformations[1][1], transform_params)
+        self.db.commit.assert_called_once()
 
         transform_params_2 = ["param1", "param2", "param3"]
         transformation_url_2 = "http://example.com/transformation_2"
         photo_with_transform = await self.repo.add_transform_photo(
-            self.photo.id,
+            self.photo,
             transform_params_2,
             transformation_url_2,
         )
@@ -378,19 +398,13 @@ class TestPostgresPhotoRepo(unittest.IsolatedAsyncioTestCase):
 
     async def test_rate_photo_success(self):
         self.repo.get_photo_by_id = AsyncMock(return_value=self.photo)
-        self.db.query.return_value.filter.return_value.first.return_value = None
-        rating = await self.repo.rate_photo(
-            self.photo.id, self.rating_in, self.user_2.id
-        )
-        assert rating.photo_id == self.photo.id
-        assert rating.user_id == self.user_2.id
-        assert rating.score == self.rating.score
-
-        self.db.query.return_value.filter.return_value.first.return_value = self.rating
-        self.rating.score = 1
+        self.db.get_bind.return_value.dialect.name = "postgresql"
+        self.db.scalars.return_value.one.return_value = self.rating
         rating = await self.repo.rate_photo(
             self.photo.id, self.rating_in, self.user_2.id
         )
+        self.db.scalars.assert_called_once()
+        self.db.commit.assert_called_once()
         assert rating.photo_id == self.photo.id
         assert rating.user_id == self.user_2.id
         assert rating.score == self.rating.score
@@ -31,11 +31,20 @@ class TestPostgresTagRepo(unittest.IsolatedAsyncioTestCase):
         self.assertIsNone(result)
 
     async def test_create_tag_success(self):
+        self.db.get_bind.return_value.dialect.name = "postgresql"
+        self.db.scalars.return_value.one_or_none.return_value = self.tag
         tag = await self.repo.create_tag(self.tag_in.name)
         self.assertEqual(self.tag.name, tag.name)
-        self.db.add.assert_called_once()
+        self.db.scalars.assert_called_once()
         self.db.commit.assert_called_once()
-        self.db.refresh.assert_called_once()
+
+    async def test_create_tag_fail_already_exists(self):
+        self.db.get_bind.return_value.dialect.name = "postgresql"
+        self.db.scalars.return_value.one_or_none.return_value = None
+        with self.assertRaises(ConflictError) as e:
+            await self.repo.create_tag(self.tag_in.name)
+        self.assertEqual(e.exception.detail, TAG_ALREADY_EXISTS)
+        self.db.commit.assert_not_called()
 
     async def test_get_tags_success(self):
         self.db.query.return_value.offset.return_value.limit.return_value.all.return_value = [
@@ -110,3 +119,9 @@ class TestPostgresTagRepo(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(self.tag.id, tag.id)
         self.db.delete.assert_called_once_with(self.tag)
         self.db.commit.assert_called_once()
+
+    async def test_get_tag_photo_ids(self):
+        self.db.scalars.return_value = iter([1, 2])
+        photo_ids = await self.repo.get_tag_photo_ids(self.tag.id)
+        self.assertEqual(photo_ids, [1, 2])
+        self.db.scalars.assert_called_once()
@@ -6,16 +6,15 @@ from sqlalchemy.orm import Session
 
 from src.conf.errors import NotFoundError, ForbiddenError
 from src.repository.users import PostgresUserRepo
-from src.database.models import User, RefreshToken, LogoutAccessToken
+from src.database.models import User
 from src.conf.constants import (
     ROLE_ADMIN,
     ROLE_STANDARD,
     ROLE_MODERATOR,
     USER_NOT_FOUND,
-    TOKEN_NOT_FOUND,
     FORBIDDEN_OPERATION_ON_ADMIN_ACCOUNT,
 )
-from src.schemas.users import UserIn, ActiveStatus, UserRoleIn
+from src.schemas.users import UserIn, UserUpdate, ActiveStatus, UserRoleIn
 
 
 class TestUsers(unittest.IsolatedAsyncioTestCase):
@@ -62,18 +61,6 @@ class TestUsers(unittest.IsolatedAsyncioTestCase):
             email="new@email.com",
             password="P@ssword1",
         )
-        self.refresh_token = RefreshToken(
-            id=1,
-            refresh_token="token",
-            user_id=self.user_standard.id,
-            session_id="session_id",
-            expires_at=datetime(2024, 5, 15, 10, 15, 00, 00),
-        )
-        self.logout_access_token = LogoutAccessToken(
-            id=1,
-            logout_access_token="logout_access_token",
-            expires_at=datetime(2024, 5, 15, 10, 15, 00, 00),
-        )
         self.active_status = ActiveStatus(is_active=False)
         self.user_role_in = UserRoleIn(role=ROLE_MODERATOR)
 
@@ -97,6 +84,27 @@ class TestUsers(unittest.IsolatedAsyncioTestCase):
         result = await self.user_repo.get_user_by_username("wrong name")
         self.assertIsNone(result)
 
+    async def test_email_or_username_exists(self):
+        self.db.query().filter().one.return_value = (1, 0)
+        result = await self.user_repo.email_or_username_exists(
+            self.user_admin.email, "free name"
+        )
+        self.assertEqual(result, (True, False))
+        self.db.query().filter().one.return_value = (None, None)
+        result = await self.user_repo.email_or_username_exists(
+            "free@email.com", "free name"
+        )
+        self.assertEqual(result, (False, False))
+
+    async def test_email_or_username_exists_excluding_user(self):
+        self.db.query().filter().filter().one.return_value = (None, None)
+        result = await self.user_repo.email_or_username_exists(
+            self.user_admin.email,
+            self.user_admin.username,
+            exclude_id=self.user_admin.id,
+        )
+        self.assertEqual(result, (False, False))
+
     async def test_get_user_by_id_success(self):
         self.db.query().filter().first.return_value = self.user_admin
         result = await self.user_repo.get_user_by_id(self.user_admin.id)
@@ -109,20 +117,27 @@ class TestUsers(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(e.exception.detail, USER_NOT_FOUND)
 
     async def test_get_users_success(self):
-        self.db.query().offset.return_value.limit.return_value.all.return_value = [
+        self.db.query().filter().order_by().limit().all.return_value = [
             self.user_admin,
             self.user_moderator,
             self.user_standard,
         ]
-        result = await self.user_repo.get_users(0, 10)
-        print(result)
+        result = await self.user_repo.get_users(None, 10)
         self.assertEqual(
             result, [self.user_admin, self.user_moderator, self.user_standard]
         )
-        self.db.query().offset.return_value.limit.return_value.all.return_value = []
-        result = await self.user_repo.get_users(0, 10)
+        self.db.query().filter().order_by().limit().all.return_value = []
+        result = await self.user_repo.get_users(3, 10)
         self.assertEqual(result, [])
 
+    async def test_get_users_selected_fields_success(self):
+        self.db.query().filter().order_by().limit().all.return_value = [
+            self.user_standard
+        ]
+        result = await self.user_repo.get_users(None, 10, ["id", "username"])
+        self.assertEqual(result, [self.user_standard])
+        self.db.query.assert_called_with(User.id, User.username)
+
     async def test_create_user_success(self):
 
         result = await self.user_repo.create_user(
@@ -163,6 +178,16 @@ class TestUsers(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result.role, self.user_admin.role)
         self.assertIsInstance(result, User)
 
+    async def test_update_user_without_password_keeps_password(self):
+        self.db.query().filter().first.return_value = self.user_admin
+        password = self.user_admin.password
+        result = await self.user_repo.update_user(
+            UserUpdate(username="new name", email="new@email.com"),
+            self.user_admin.id,
+        )
+        self.assertEqual(result.username, "new name")
+        self.assertEqual(result.password, password)
+
     async def test_update_user_fail(self):
         self.db.query().filter().first.return_value = None
         with self.assertRaises(NotFoundError) as e:
@@ -200,53 +225,16 @@ class TestUsers(unittest.IsolatedAsyncioTestCase):
             await self.user_repo.delete_user(999)
         self.assertEqual(e.exception.detail, USER_NOT_FOUND)
 
-    async def test_add_refresh_token_success(self):
-        result = await self.user_repo.add_refresh_token(
-            1, "refresh_token", datetime.utcnow(), "session_id"
-        )
-        self.assertEqual(result, None)
-
-    async def test_delete_refresh_token_success(self):
-        self.db.query().filter().first.return_value = self.refresh_token
-        result = await self.user_repo.delete_refresh_token(
-            self.refresh_token.refresh_token, self.user_admin.id
-        )
-        self.assertEqual(result, None)
-
-    async def test_delete_refresh_token_fail(self):
-        self.db.query().filter().first.return_value = None
-        with self.assertRaises(NotFoundError) as e:
-            await self.user_repo.delete_refresh_token("wrong_token", self.user_admin.id)
-        self.assertEqual(e.exception.detail, TOKEN_NOT_FOUND)
-
-    async def test_logout_user_success(self):
-        self.db.query().filter().first.return_value = self.refresh_token
-        result = await self.user_repo.logout_user(
-            self.refresh_token.refresh_token,
-            self.refresh_token.session_id,
-            self.user_standard,
-        )
-        self.assertEqual(result, self.user_standard)
-
-    async def test_logout_user_fail(self):
-        self.db.query().filter().first.return_value = None
-        with self.assertRaises(NotFoundError) as e:
-            await self.user_repo.logout_user(
-                "wrong_token",
-                "wrong_session_id",
-                self.user_standard,
-            )
-        self.assertEqual(e.exception.detail, TOKEN_NOT_FOUND)
+    async def test_get_user_photo_ids(self):
+        self.db.scalars.return_value = iter([1, 2])
+        photo_ids = await self.user_repo.get_user_photo_ids(self.user_standard.id)
+        self.assertEqual(photo_ids, [1, 2])
+        self.db.scalars.assert_called_once()
 
-    async def test_is_user_logout(self):
-        self.db.query().filter().first.return_value = self.logout_access_token
-        result = await self.user_repo.is_user_logout(
-            self.logout_access_token.logout_access_token
+    async def test_update_user_password_success(self):
+        result = await self.user_repo.update_user_password(
+            self.user_standard.id, "new_hashed_password"
         )
-        self.assertEqual(result, self.logout_access_token)
-
-        self.db.query().filter().first.return_value = None
-        result = await self.user_repo.is_user_logout("wrong_token")
         self.assertEqual(result, None)
 
     async def test_set_user_active_status_success(self):
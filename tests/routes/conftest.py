@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 from fastapi import File
@@ -14,14 +16,16 @@ from src.database.dependencies import (
     get_photo_storage_provider,
     get_comment_repository,
     get_tag_repository,
+    get_cache,
 )
 from src.repository.comments import PostgresCommentRepo
 from src.repository.tags import PostgresTagRepo
 from src.repository.users import PostgresUserRepo
 from src.repository.photos import PostgresPhotoRepo
 from src.schemas.photos import TransformIn
-from src.services.abstract import AbstractPhotoStorageProvider
+from src.services.abstract import AbstractPhotoStorageProvider, AbstractCache
 from src.services.avatar import AvatarProviderGravatar
+from src.services.auth import auth_service
 from src.conf.constants import ROLE_ADMIN, ROLE_MODERATOR, API, AUTH
 
 
@@ -92,6 +96,9 @@ def client_app(session):
     def override_get_photo_storage_provider():
         return MockCloudinaryPhotoStorageProvider()
 
+    def override_get_cache():
+        return MockCache()
+
     def override_RateLimiter():
         return None
 
@@ -102,6 +109,7 @@ def client_app(session):
         get_comment_repository: override_get_comment_repository,
         get_tag_repository: override_get_tag_repository,
         get_photo_storage_provider: override_get_photo_storage_provider,
+        get_cache: override_get_cache,
         RateLimiter: override_RateLimiter,
     }
 
@@ -141,41 +149,47 @@ def tokens(session, client_app):
     user = session.query(User).filter(User.email == EMAIL_STANDARD).first()
     user.is_active = True
     session.commit()
-    response = client_app.post(
-        f"{API}{AUTH}/login",
-        data={
-            "username": EMAIL_STANDARD,
-            "password": PASSWORD,
-        },
-    )
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        response = client_app.post(
+            f"{API}{AUTH}/login",
+            data={
+                "username": EMAIL_STANDARD,
+                "password": PASSWORD,
+            },
+        )
     data = response.json()
     return data
 
 
 @pytest.fixture(scope="function")
 def access_token_user_standard(session, client_app, user_in_standard_json):
-    client_app.post(f"{API}{AUTH}/signup", json=user_in_standard_json)
-    response = client_app.post(
-        f"{API}{AUTH}/login",
-        data={
-            "username": EMAIL_STANDARD,
-            "password": PASSWORD,
-        },
-    )
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        client_app.post(f"{API}{AUTH}/signup", json=user_in_standard_json)
+        response = client_app.post(
+            f"{API}{AUTH}/login",
+            data={
+                "username": EMAIL_STANDARD,
+                "password": PASSWORD,
+            },
+        )
     data = response.json()
     return data["access_token"]
 
 
 @pytest.fixture(scope="function")
 def access_token_user_admin(session, client_app, user_in_admin_json):
-    client_app.post(f"{API}{AUTH}/signup", json=user_in_admin_json)
-    response = client_app.post(
-        f"{API}{AUTH}/login",
-        data={
-            "username": EMAIL_ADMIN,
-            "password": PASSWORD,
-        },
-    )
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        client_app.post(f"{API}{AUTH}/signup", json=user_in_admin_json)
+        response = client_app.post(
+            f"{API}{AUTH}/login",
+            data={
+                "username": EMAIL_ADMIN,
+                "password": PASSWORD,
+            },
+        )
     data = response.json()
     session.query(User).filter(User.email == EMAIL_ADMIN).update(
         {
@@ -188,14 +202,16 @@ def access_token_user_admin(session, client_app, user_in_admin_json):
 
 @pytest.fixture(scope="function")
 def access_token_user_moderator(session, client_app, user_in_moderator_json):
-    client_app.post(f"{API}{AUTH}/signup", json=user_in_moderator_json)
-    response = client_app.post(
-        f"{API}{AUTH}/login",
-        data={
-            "username": EMAIL_MODERATOR,
-            "password": PASSWORD,
-        },
-    )
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        client_app.post(f"{API}{AUTH}/signup", json=user_in_moderator_json)
+        response = client_app.post(
+            f"{API}{AUTH}/login",
+            data={
+                "username": EMAIL_MODERATOR,
+                "password": PASSWORD,
+            },
+        )
     data = response.json()
     session.query(User).filter(User.email == EMAIL_MODERATOR).update(
         {
@@ -364,3 +380,14 @@ class MockCloudinaryPhotoStorageProvider(AbstractPhotoStorageProvider):
         self, photo_url: str, transform: TransformIn
     ) -> (str, list[str]):
         return TRANSFORM_PHOTO_URL, TRANSFORM_PARAMS
+
+
+class MockCache(AbstractCache):
+    async def get(self, key: str) -> bytes | None:
+        return None
+
+    async def set(self, key: str, value: str | bytes, expire: int) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        pass
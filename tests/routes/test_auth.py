@@ -49,42 +49,64 @@ def test_signup_fail(client_app, user_in_standard_json):
 
 
 def test_login_success(client_app, user_in_standard_json):
-    response = client_app.post(
-        f"{API}{AUTH}/login",
-        data={
-            "username": user_in_standard_json.get("email"),
-            "password": user_in_standard_json.get("password"),
-        },
-    )
-    assert response.status_code == status.HTTP_200_OK, response.text
-    data = response.json()
-    assert data["token_type"] == "bearer"
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        response = client_app.post(
+            f"{API}{AUTH}/login",
+            data={
+                "username": user_in_standard_json.get("email"),
+                "password": user_in_standard_json.get("password"),
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK, response.text
+        data = response.json()
+        assert data["token_type"] == "bearer"
 
 
 def test_login_fail_wrong_email(client_app, user_in_standard_json):
-    response = client_app.post(
-        f"{API}{AUTH}/login",
-        data={
-            "username": "wrong_email@email.com",
-            "password": user_in_standard_json.get("password"),
-        },
-    )
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        response = client_app.post(
+            f"{API}{AUTH}/login",
+            data={
+                "username": "wrong_email@email.com",
+                "password": user_in_standard_json.get("password"),
+            },
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED, response.text
+        data = response.json()
+        assert data["detail"] == INCORRECT_USERNAME_OR_PASSWORD
+
+
+def test_login_fail_unknown_email_cached(client_app, user_in_standard_json):
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = ""
+        response = client_app.post(
+            f"{API}{AUTH}/login",
+            data={
+                "username": "wrong_email@email.com",
+                "password": user_in_standard_json.get("password"),
+            },
+        )
+        mock_redis.set.assert_not_called()
     assert response.status_code == status.HTTP_401_UNAUTHORIZED, response.text
     data = response.json()
     assert data["detail"] == INCORRECT_USERNAME_OR_PASSWORD
 
 
 def test_login_fail_wrong_password(client_app, user_in_standard_json):
-    response = client_app.post(
-        f"{API}{AUTH}/login",
-        data={
-            "username": user_in_standard_json.get("email"),
-            "password": "wrong_password",
-        },
-    )
-    assert response.status_code == status.HTTP_401_UNAUTHORIZED, response.text
-    data = response.json()
-    assert data["detail"] == INCORRECT_USERNAME_OR_PASSWORD
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        response = client_app.post(
+            f"{API}{AUTH}/login",
+            data={
+                "username": user_in_standard_json.get("email"),
+                "password": "wrong_password",
+            },
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED, response.text
+        data = response.json()
+        assert data["detail"] == INCORRECT_USERNAME_OR_PASSWORD
 
 
 def test_login_fail_user_banned(session, client_app, user_in_standard_json):
@@ -93,16 +115,18 @@ def test_login_fail_user_banned(session, client_app, user_in_standard_json):
     )
     user.is_active = False
     session.commit()
-    response = client_app.post(
-        f"{API}{AUTH}/login",
-        data={
-            "username": user_in_standard_json.get("email"),
-            "password": user_in_standard_json.get("password"),
-        },
-    )
-    assert response.status_code == status.HTTP_403_FORBIDDEN, response.text
-    data = response.json()
-    assert data["detail"] == BANNED_USER
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        response = client_app.post(
+            f"{API}{AUTH}/login",
+            data={
+                "username": user_in_standard_json.get("email"),
+                "password": user_in_standard_json.get("password"),
+            },
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN, response.text
+        data = response.json()
+        assert data["detail"] == BANNED_USER
 
 
 def test_refresh_token_success(client_app, tokens):
@@ -138,6 +162,19 @@ def test_refresh_token_wrong_token(client_app, tokens):
         assert data["detail"] == INVALID_SCOPE
 
 
+def test_refresh_token_fail_already_used(client_app, tokens):
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        mock_redis.set.return_value = None
+        response = client_app.get(
+            f"{API}{AUTH}/refresh_token",
+            headers={"Authorization": f"Bearer {tokens['refresh_token']}"},
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED, response.text
+        data = response.json()
+        assert data["detail"] == LOG_IN_AGAIN
+
+
 def test_refresh_token_no_user(
     session,
     client_app,
@@ -191,6 +228,10 @@ def test_logout_fail_user_already_logout(
             f"{API}{AUTH}/logout",
             headers={"Authorization": f"Bearer {access_token_user_standard}"},
         )
+        # session is now on the blacklist
+        mock_redis.get.side_effect = lambda key: (
+            "" if key.startswith("blacklist:") else None
+        )
         response = client_app.post(
             f"{API}{AUTH}/logout",
             headers={"Authorization": f"Bearer {access_token_user_standard}"},
@@ -14,7 +14,6 @@ from src.conf.constants import (
     PHOTO_NOT_FOUND,
     FORBIDDEN_FOR_NOT_OWNER_AND_MODERATOR,
     USER_NOT_FOUND,
-    INVALID_SORT_TYPE,
     FORBIDDEN_FOR_NOT_OWNER,
     FORBIDDEN_FOR_OWNER,
     RATING_DELETED,
@@ -23,6 +22,9 @@ from src.conf.constants import (
     PHOTO_DELETED,
     PHOTO_UPDATED,
     PHOTO_RATED,
+    QR_CODE_CACHE_CONTROL,
+    INVALID_CURSOR,
+    NEXT_CURSOR_HEADER,
 )
 from tests.routes.conftest import (
     EMAIL_STANDARD,
@@ -33,7 +35,7 @@ from tests.routes.conftest import (
     TRANSFORM_PARAMS,
 )
 from src.conf.constants import PHOTOS
-from src.schemas.photos import PhotoIn
+from src.schemas.photos import PhotoIn, PhotoCursor
 
 
 def test_create_photo_success(client_app, photo_in_json, access_token_user_standard):
@@ -267,6 +269,100 @@ def test_get_photos_all_no_query_success(
     assert data[1]["id"] == photo_2.id
 
 
+def test_get_photos_with_cursor_success(
+    session, client_app, photo, photo_2, access_token_user_standard
+):
+    session.query(Photo).delete()
+    session.commit()
+    session.add(photo)
+    session.add(photo_2)
+    session.commit()
+    photo_id = photo.id
+    photo_2_id = photo_2.id
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        response = client_app.get(
+            f"{API}{PHOTOS}?limit=1",
+            headers={"Authorization": f"Bearer {access_token_user_standard}"},
+        )
+        assert response.status_code == status.HTTP_200_OK, response.text
+        assert response.json()[0]["id"] == photo_id
+        cursor = response.headers[NEXT_CURSOR_HEADER]
+        response = client_app.get(
+            f"{API}{PHOTOS}?limit=1&skip=1&cursor={cursor}",
+            headers={"Authorization": f"Bearer {access_token_user_standard}"},
+        )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["id"] == photo_2_id
+
+
+def test_get_photos_invalid_cursor_fail(
+    session, client_app, access_token_user_standard
+):
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        response = client_app.get(
+            f"{API}{PHOTOS}?cursor=invalid",
+            headers={"Authorization": f"Bearer {access_token_user_standard}"},
+        )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY, response.text
+    assert response.json()["detail"] == INVALID_CURSOR
+
+
+def test_get_photos_cursor_sort_mismatch_fail(
+    session, client_app, photo, photo_2, access_token_user_standard
+):
+    session.query(Photo).delete()
+    session.commit()
+    session.add(photo)
+    session.add(photo_2)
+    session.commit()
+    headers = {"Authorization": f"Bearer {access_token_user_standard}"}
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        response = client_app.get(
+            f"{API}{PHOTOS}?limit=1&sort_by=rating-desc", headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK, response.text
+        rating_cursor = response.headers[NEXT_CURSOR_HEADER]
+        response = client_app.get(
+            f"{API}{PHOTOS}?limit=1&sort_by=upload_date-desc&cursor={rating_cursor}",
+            headers=headers,
+        )
+        assert (
+            response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        ), response.text
+        assert response.json()["detail"] == INVALID_CURSOR
+
+        response = client_app.get(f"{API}{PHOTOS}?limit=1", headers=headers)
+        assert response.status_code == status.HTTP_200_OK, response.text
+        unsorted_cursor = response.headers[NEXT_CURSOR_HEADER]
+        response = client_app.get(
+            f"{API}{PHOTOS}?limit=1&sort_by=rating-asc&cursor={unsorted_cursor}",
+            headers=headers,
+        )
+        assert (
+            response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        ), response.text
+        assert response.json()["detail"] == INVALID_CURSOR
+
+
+def test_get_photos_cursor_without_value_fail(
+    session, client_app, access_token_user_standard
+):
+    cursor = PhotoCursor(id=1, sort_by="upload_date-desc").encode()
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        response = client_app.get(
+            f"{API}{PHOTOS}?sort_by=upload_date-desc&cursor={cursor}",
+            headers={"Authorization": f"Bearer {access_token_user_standard}"},
+        )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY, response.text
+    assert response.json()["detail"] == INVALID_CURSOR
+
+
 def test_get_photos_all_with_query_success(
     session, client_app, photo, photo_2, access_token_user_standard
 ):
@@ -414,8 +510,8 @@ def test_get_photos_wrong_sort_by_text_fail(
             f"{API}{PHOTOS}?sort_by=test",
             headers={"Authorization": f"Bearer {access_token_user_standard}"},
         )
-    assert response.status_code == status.HTTP_502_BAD_GATEWAY, response.text
-    assert response.json()["detail"] == INVALID_SORT_TYPE
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY, response.text
+    assert response.json()["detail"][0]["loc"] == ["query", "sort_by"]
 
 
 def test_get_qr_code_success(
@@ -436,6 +532,37 @@ def test_get_qr_code_success(
         )
     assert response.status_code == status.HTTP_200_OK, response.text
     assert response.headers["Content-Type"] == "image/png"
+    assert response.headers["Cache-Control"] == QR_CODE_CACHE_CONTROL
+    assert response.headers["ETag"]
+
+
+def test_get_qr_code_not_modified(
+    session,
+    client_app,
+    photo,
+    access_token_user_standard,
+):
+    session.query(Photo).delete()
+    session.commit()
+    session.add(photo)
+    session.commit()
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        response = client_app.get(
+            f"{API}{PHOTOS}/{photo.id}/qr_code",
+            headers={"Authorization": f"Bearer {access_token_user_standard}"},
+        )
+        etag = response.headers["ETag"]
+        response = client_app.get(
+            f"{API}{PHOTOS}/{photo.id}/qr_code",
+            headers={
+                "Authorization": f"Bearer {access_token_user_standard}",
+                "If-None-Match": etag,
+            },
+        )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
 
 
 def test_get_qr_code_with_transform_id_success(
@@ -643,6 +770,38 @@ def test_rate_photo_success(
         assert data["detail"] == PHOTO_RATED
 
 
+def test_rate_photo_twice_updates_existing_rating(
+    session,
+    client_app,
+    photo_2,
+    rating_in_json,
+    access_token_user_standard,
+):
+    session.query(Photo).delete()
+    session.query(Rating).delete()
+    session.commit()
+    session.add(photo_2)
+    session.commit()
+    session.refresh(photo_2)
+    photo_2_id = photo_2.id
+    user_id = 1
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        for score in (5, 2):
+            rating_in_json["score"] = score
+            response = client_app.post(
+                f"{API}{PHOTOS}/{photo_2_id}/rate",
+                json=rating_in_json,
+                headers={"Authorization": f"Bearer {access_token_user_standard}"},
+            )
+            assert response.status_code == status.HTTP_200_OK, response.text
+    ratings = (
+        session.query(Rating).filter_by(photo_id=photo_2_id, user_id=user_id).all()
+    )
+    assert len(ratings) == 1
+    assert ratings[0].score == 2
+
+
 def test_rate_photo_with_invalid_photo_id_fail(
     client_app,
     rating_in_json,
@@ -15,6 +15,7 @@ from src.conf.constants import (
     FORBIDDEN_FOR_USER,
     FORBIDDEN_OPERATION_ON_ADMIN_ACCOUNT,
     ROLE_MODERATOR,
+    NEXT_CURSOR_HEADER,
 )
 from src.database.models import User
 from src.services.auth import auth_service
@@ -25,6 +26,7 @@ from tests.routes.conftest import (
     USERNAME_STANDARD,
     AVATAR_URL,
     EMAIL_ADMIN,
+    MockCache,
 )
 
 
@@ -66,6 +68,36 @@ def test_get_users_success(
         assert "id" in data[0]
 
 
+def test_get_users_next_cursor(client_app, access_token_user_admin):
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        headers = {"Authorization": f"Bearer {access_token_user_admin}"}
+        response = client_app.get(f"{API}{USERS}?limit=2", headers=headers)
+        assert response.status_code == status.HTTP_200_OK, response.text
+        data = response.json()
+        assert len(data) == 2
+        after_id = response.headers[NEXT_CURSOR_HEADER]
+        assert after_id == str(data[-1]["id"])
+        response = client_app.get(
+            f"{API}{USERS}?limit=2&after_id={after_id}", headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK, response.text
+        assert len(response.json()) == 1
+        assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_get_users_limit_too_high(client_app, access_token_user_admin):
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        response = client_app.get(
+            f"{API}{USERS}?limit=101",
+            headers={"Authorization": f"Bearer {access_token_user_admin}"},
+        )
+        assert (
+            response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        ), response.text
+
+
 def test_get_user_success(
     session,
     client_app,
@@ -108,6 +140,22 @@ def test_get_user_success(
         assert "role" in data
 
 
+def test_get_user_not_modified(session, client_app, access_token_user_standard):
+    user_standard = session.query(User).filter_by(email=EMAIL_STANDARD).first()
+    with patch.object(auth_service, "redis_connection") as mock_redis:
+        mock_redis.get.return_value = None
+        headers = {"Authorization": f"Bearer {access_token_user_standard}"}
+        response = client_app.get(f"{API}{USERS}/{user_standard.id}", headers=headers)
+        assert response.status_code == status.HTTP_200_OK, response.text
+        etag = response.headers["etag"]
+        response = client_app.get(
+            f"{API}{USERS}/{user_standard.id}",
+            headers={**headers, "If-None-Match": etag},
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+
+
 def test_get_user_fail(
     client_app,
     access_token_user_admin,
@@ -144,6 +192,7 @@ def test_update_user_success(
         assert data["user"]["id"] == user_moderator.id
         assert data["user"]["username"] == new_username
         assert data["user"]["email"] == new_email
+        mock_redis.delete.assert_any_call(f"unknown_email:{new_email}")
     user_moderator = session.query(User).filter_by(id=user_moderator.id).first()
     user_moderator.username = USERNAME_MODERATOR
     user_moderator.email = EMAIL_MODERATOR
@@ -197,7 +246,9 @@ def test_delete_user_success(
     session, client_app, access_token_user_admin, access_token_user_standard
 ):
     user_moderator = session.query(User).filter_by(email=EMAIL_MODERATOR).first()
-    with patch.object(auth_service, "redis_connection") as mock_redis:
+    with patch.object(auth_service, "redis_connection") as mock_redis, patch.object(
+        MockCache, "delete"
+    ) as mock_cache_delete:
         mock_redis.get.return_value = None
         response = client_app.delete(
             f"{API}{USERS}/{user_moderator.id}",
@@ -207,6 +258,7 @@ def test_delete_user_success(
         data = response.json()
         assert data["detail"] == USER_DELETE
         assert data["user"]["id"] == user_moderator.id
+        mock_cache_delete.assert_awaited_once()
 
         user_standard = session.query(User).filter_by(email=EMAIL_STANDARD).first()
         response = client_app.delete(
@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.services.photo_storage_provider import CloudinaryPhotoStorageProvider
+from src.conf.constants import (
+    CLOUDINARY_PHOTO_PUBLIC_ID_PREFIX,
+    CLOUDINARY_AVATAR_PUBLIC_ID_PREFIX,
+    PHOTO_UPLOAD_CHUNK_SIZE,
+)
+
+
+class TestCloudinaryPhotoStorageProvider(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.provider = CloudinaryPhotoStorageProvider()
+        self.upload_large = MagicMock(
+            return_value={
+                "secure_url": "https://res.cloudinary.com/test/image/upload/v1/photo.jpg",
+                "public_id": "avatar/test",
+                "version": 1,
+            }
+        )
+        self.file = MagicMock()
+
+    async def test_upload_photo_sends_image_resource_type(self):
+        with patch.object(
+            self.provider.cloudinary.uploader, "upload_large", self.upload_large
+        ):
+            url = await self.provider.upload_photo(self.file)
+        self.assertEqual(
+            "https://res.cloudinary.com/test/image/upload/v1/photo.jpg", url
+        )
+        self.upload_large.assert_called_once_with(
+            self.file.file,
+            chunk_size=PHOTO_UPLOAD_CHUNK_SIZE,
+            resource_type="image",
+            public_id_prefix=CLOUDINARY_PHOTO_PUBLIC_ID_PREFIX,
+            overwrite=True,
+        )
+
+    async def test_upload_avatar_sends_image_resource_type(self):
+        with patch.object(
+            self.provider.cloudinary.uploader, "upload_large", self.upload_large
+        ):
+            await self.provider.upload_avatar(self.file)
+        self.upload_large.assert_called_once_with(
+            self.file.file,
+            chunk_size=PHOTO_UPLOAD_CHUNK_SIZE,
+            resource_type="image",
+            public_id_prefix=CLOUDINARY_AVATAR_PUBLIC_ID_PREFIX,
+            overwrite=True,
+        )